@@ -49,6 +49,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from enum import Enum
 
 logger = logging.getLogger("shadow-ehr")
@@ -100,11 +101,23 @@ class ClinicalContext:
     critical_limb_ischemia: bool
     prior_vascular_intervention: bool
 
+    # Contexts are built once per clinical_cache version and read by several
+    # endpoints, so both renderings are computed on first use and kept.
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Shallow copy: callers may add or pop keys without touching the cached
+        # rendering; nested lists are shared and must be treated as read-only
+        return dict(self._as_dict)
 
     def to_prompt(self) -> str:
         """Generate a structured prompt for LLM summarization."""
+        return self._prompt
+
+    @cached_property
+    def _as_dict(self) -> Dict:
+        return asdict(self)
+
+    @cached_property
+    def _prompt(self) -> str:
         return f"""## Clinical Context for Patient {self.patient_id}
 Generated: {self.generated_at}
 
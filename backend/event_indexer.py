@@ -76,9 +76,11 @@ Subcategories (examples):
 ==============================================================================
 """
 
+import asyncio
 import re
 import json
 import hashlib
+import orjson
 import logging
 from enum import Enum
 from datetime import datetime
@@ -620,9 +622,18 @@ class EventIndexer:
         return entry
 
     async def _append_index_entry(self, entry: IndexEntry):
-        """Append entry to JSONL index file."""
-        with self.index_path.open('a') as f:
-            f.write(json.dumps(entry.to_dict()) + '\n')
+        """Append entry to JSONL index file (on a worker thread, off the event loop)."""
+        record = entry.to_dict()
+        try:
+            line = orjson.dumps(record) + b'\n'
+        except TypeError:
+            # e.g. ints beyond 64 bits, which stdlib json still handles
+            line = json.dumps(record).encode() + b'\n'
+        await asyncio.to_thread(self._write_line, line)
+
+    def _write_line(self, line: bytes):
+        with self.index_path.open('ab') as f:
+            f.write(line)
 
     def query(
         self,
@@ -653,7 +664,7 @@ class EventIndexer:
         with self.index_path.open() as f:
             for line in f:
                 try:
-                    entry = json.loads(line)
+                    entry = orjson.loads(line)
 
                     # Apply filters
                     if patient_id and entry.get('patient_id') != patient_id:
@@ -688,7 +699,7 @@ class EventIndexer:
         with self.index_path.open() as f:
             for line in f:
                 try:
-                    entry = json.loads(line)
+                    entry = orjson.loads(line)
                     cat = entry.get('category', 'unknown')
                     stats[cat] = stats.get(cat, 0) + 1
                 except json.JSONDecodeError:
@@ -729,7 +740,7 @@ class EventIndexer:
             with self.index_path.open() as f:
                 for line in f:
                     try:
-                        entry = json.loads(line)
+                        entry = orjson.loads(line)
                         if entry.get('indexer_version') == INDEXER_VERSION:
                             existing_ids.add(entry.get('event_id'))
                     except json.JSONDecodeError:
@@ -742,7 +753,7 @@ class EventIndexer:
                 stats['total_events'] += 1
 
                 try:
-                    raw_event = json.loads(line)
+                    raw_event = orjson.loads(line)
                     event_id = raw_event.get('id')
 
                     if not force and event_id in existing_ids:
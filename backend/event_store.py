@@ -4,24 +4,84 @@ import asyncio
 import json
 import logging
 import uuid
+
+import orjson
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 
+# Writer drains at most this many records, or waits this long for more, per file write
+WRITE_BATCH_MAX = 64
+WRITE_BATCH_WAIT = 0.05
+
+
 class EventStore:
-    """Append-only JSONL storage for intercepted events and interpreter index entries."""
+    """Append-only JSONL storage for intercepted events and interpreter index entries.
+
+    Appends are queued and written in batches by a background task on a worker
+    thread, so callers on the event loop never block on disk I/O.
+    """
 
     def __init__(self, root: Path | str = Path("data")):
         self.root = Path(root)
         self.raw_path = self.root / "raw_events.jsonl"
         self.index_path = self.root / "event_index.jsonl"
         self.root.mkdir(parents=True, exist_ok=True)
-        self._lock = asyncio.Lock()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
         self._logger = logging.getLogger("shadow-ehr")
 
-    async def append_raw_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
-        """Store a raw intercepted event and return the normalized record."""
+    def _enqueue(self, path: Path, record: Dict[str, Any]):
+        # Writer starts lazily: the store is built at import, before a loop is running
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._writer_loop())
+        self._queue.put_nowait((path, record))
+
+    async def _writer_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                while len(batch) < WRITE_BATCH_MAX:
+                    batch.append(await asyncio.wait_for(self._queue.get(), WRITE_BATCH_WAIT))
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self._logger.error("Event store write failed (%d records lost): %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _write_batch(batch: List[tuple]):
+        """Encode and append a batch, one open/write per target file (runs off the loop)."""
+        lines: Dict[Path, List[bytes]] = {}
+        for path, record in batch:
+            try:
+                encoded = orjson.dumps(record)
+            except TypeError:
+                # e.g. ints beyond 64 bits, which stdlib json still handles
+                encoded = json.dumps(record).encode()
+            lines.setdefault(path, []).append(encoded)
+        for path, encoded_lines in lines.items():
+            with path.open("ab") as f:
+                f.write(b"\n".join(encoded_lines) + b"\n")
+
+    async def flush(self):
+        """Wait until every queued record has been written (called on shutdown)."""
+        if self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def append_raw_event(self, event: Dict[str, Any],
+                               encoded_payload: Optional[bytes] = None) -> Dict[str, Any]:
+        """
+        Store a raw intercepted event and return the normalized record.
+
+        encoded_payload, when the caller already serialized the payload, is
+        spliced into the stored line as-is instead of encoding it again.
+        """
 
         normalized = {
             "id": event.get("id") or str(uuid.uuid4()),
@@ -31,16 +91,18 @@ class EventStore:
             "status": event.get("status"),
             "patient_id": event.get("patient_id"),
             "payload_size": event.get("payload_size", 0),
+            "wire_size": event.get("wire_size"),  # received frame/body length, if known
             "payload": event.get("payload"),
             "source": event.get("source", "unknown"),
         }
 
-        async with self._lock:
-            with self.raw_path.open("a") as f:
-                f.write(json.dumps(normalized) + "\n")
+        if encoded_payload is not None:
+            self._enqueue(self.raw_path, {**normalized, "payload": orjson.Fragment(encoded_payload)})
+        else:
+            self._enqueue(self.raw_path, normalized)
 
         self._logger.debug(
-            "Raw event appended: %s %s (patient=%s)"
+            "Raw event queued: %s %s (patient=%s)"
             % (
                 normalized["method"],
                 normalized["endpoint"][:60],
@@ -61,12 +123,10 @@ class EventStore:
             "notes": entry.get("notes", ""),
         }
 
-        async with self._lock:
-            with self.index_path.open("a") as f:
-                f.write(json.dumps(normalized) + "\n")
+        self._enqueue(self.index_path, normalized)
 
         self._logger.debug(
-            "Index entry appended: event=%s type=%s patient=%s",
+            "Index entry queued: event=%s type=%s patient=%s",
             normalized.get("event_id"),
             normalized["record_type"],
             normalized.get("patient_id") or "unknown",
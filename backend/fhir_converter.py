@@ -7,6 +7,7 @@ AthenaNet's non-standard API responses into valid FHIR R4 structures.
 
 import re
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import hashlib
@@ -51,46 +52,52 @@ def normalize_date(date_str: Optional[str]) -> str:
     return date_str  # Return original if no format matches
 
 
+# Endpoint patterns carrying a patient ID, most specific first (compiled once)
+_PATIENT_ID_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'/chart/patient/(\d+)',
+    r'/chart/(\d+)',
+    r'/patients/(\d+)',
+    r'/patient/(\d+)',
+    r'/encounter/(\d+)',
+    r'patientid[=/](\d+)',
+    r'patient_id[=/](\d+)',
+    r'patient[=/](\d+)',
+    r'chartid[=/](\d+)',
+    r'/api/\d+/chart/(\d+)',
+    r'/api/v\d+/patients?/(\d+)',
+    # AthenaNet specific patterns
+    r'athena[^/]*/(\d{5,})',  # Athena IDs are typically 5+ digits
+    r'/(\d{6,})/(?:vitals|meds|problems|labs|allergies)',  # ID before resource type
+)]
+# Fallback: any 6+ digit path segment that might be a patient ID
+_PATIENT_ID_FALLBACK = re.compile(r'/(\d{6,})(?:/|$|\?)')
+
+
 def extract_patient_id(endpoint: str) -> Optional[str]:
     """Extract patient ID from AthenaNet API endpoint."""
-    patterns = [
-        r'/chart/patient/(\d+)',
-        r'/chart/(\d+)',
-        r'/patients/(\d+)',
-        r'/patient/(\d+)',
-        r'/encounter/(\d+)',
-        r'patientid[=/](\d+)',
-        r'patient_id[=/](\d+)',
-        r'patient[=/](\d+)',
-        r'chartid[=/](\d+)',
-        r'/api/\d+/chart/(\d+)',
-        r'/api/v\d+/patients?/(\d+)',
-        # AthenaNet specific patterns
-        r'athena[^/]*/(\d{5,})',  # Athena IDs are typically 5+ digits
-        r'/(\d{6,})/(?:vitals|meds|problems|labs|allergies)',  # ID before resource type
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, endpoint, re.IGNORECASE)
+    for pattern in _PATIENT_ID_PATTERNS:
+        match = pattern.search(endpoint)
         if match:
-            logger.debug(f"[FHIR] Patient ID extracted: {match.group(1)} from pattern: {pattern}")
+            logger.debug("[FHIR] Patient ID extracted: %s from pattern: %s", match.group(1), pattern.pattern)
             return match.group(1)
 
-    # Fallback: look for any 6+ digit number that might be a patient ID
-    fallback = re.search(r'/(\d{6,})(?:/|$|\?)', endpoint)
+    fallback = _PATIENT_ID_FALLBACK.search(endpoint)
     if fallback:
-        logger.debug(f"[FHIR] Patient ID extracted (fallback): {fallback.group(1)}")
+        logger.debug("[FHIR] Patient ID extracted (fallback): %s", fallback.group(1))
         return fallback.group(1)
 
-    logger.debug(f"[FHIR] No patient ID found in: {endpoint[:100]}")
+    logger.debug("[FHIR] No patient ID found in: %.100s", endpoint)
     return None
 
 
-def detect_record_type(endpoint: str, payload: Any) -> str:
-    """Detect the type of clinical record from endpoint and payload."""
-    endpoint_lower = endpoint.lower()
-    logger.debug(f"[FHIR] Detecting record type for: {endpoint_lower[:80]}...")
+# Digit runs (chart ids, encounter ids, timestamps) collapse to one key per URL shape;
+# no endpoint pattern below contains a digit, so classification is unaffected
+_DIGIT_RUN_RE = re.compile(r'\d+', re.ASCII)
+
 
+@lru_cache(maxsize=1024)
+def _record_type_from_endpoint(endpoint_lower: str) -> Optional[str]:
+    """Endpoint-only part of detect_record_type, memoized per URL shape (None = no match)."""
     # =========================================================================
     # ACTIVE FETCH URL PATTERNS (synthetic URLs from activeFetcher.js)
     # Pattern: active-fetch/FETCH_<type>
@@ -182,6 +189,18 @@ def detect_record_type(endpoint: str, payload: Any) -> str:
         logger.info(f"[FHIR] Record type: ALLERGY")
         return 'allergy'
 
+    return None
+
+
+def detect_record_type(endpoint: str, payload: Any) -> str:
+    """Detect the type of clinical record from endpoint and payload."""
+    endpoint_lower = endpoint.lower()
+    logger.debug(f"[FHIR] Detecting record type for: {endpoint_lower[:80]}...")
+
+    record_type = _record_type_from_endpoint(_DIGIT_RUN_RE.sub('0', endpoint_lower))
+    if record_type is not None:
+        return record_type
+
     # Fallback: check payload structure
     logger.debug(f"[FHIR] No endpoint match, checking payload keys...")
     if isinstance(payload, dict):
@@ -1083,13 +1102,21 @@ def build_patient_from_aggregated_data(
     )
 
 
-def create_log_entry(endpoint: str, method: str, payload: Any, fhir_resource: Any) -> LogEntry:
-    """Create a LogEntry for the frontend live log."""
-    payload_size = len(str(payload).encode('utf-8')) if payload else 0
+def create_log_entry(endpoint: str, method: str, payload: Any, fhir_resource: Any,
+                     payload_size: Optional[int] = None) -> LogEntry:
+    """
+    Create a LogEntry for the frontend live log.
+
+    payload_size is the encoded payload size in bytes when the caller has
+    already measured it; otherwise it is estimated from str(payload).
+    """
+    if payload_size is None:
+        payload_size = len(str(payload).encode('utf-8')) if payload else 0
+    now_iso = datetime.now().isoformat()
 
     return LogEntry(
-        id=generate_id(f"{endpoint}{datetime.now().isoformat()}"),
-        timestamp=datetime.now().isoformat(),
+        id=generate_id(f"{endpoint}{now_iso}"),
+        timestamp=now_iso,
         method=method,
         endpoint=endpoint,
         status=200,
@@ -17,13 +17,21 @@ env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path, override=True)
 
 import asyncio
-import json
+import hashlib
 import logging
+import orjson
+import os
+import queue
+import re
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from pythonjsonlogger import jsonlogger
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from active_routes import router as active_router, set_main_cache
 from event_store import EventStore
@@ -35,7 +43,7 @@ from clinical_interpreters import (
 )
 from ai_summarizer import (
     get_summarizer, generate_context, generate_briefing,
-    generate_med_alert, ClinicalSummarizer, SummaryType
+    generate_med_alert, ClinicalSummarizer, ClinicalContext, SummaryType
 )
 from provenance import Provenance, sha256_json
 from files import (
@@ -57,12 +65,14 @@ from telemetry import (
     emit_data_quality, emit_transfer_summary
 )
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
 from vision_discovery import router as discovery_router
 
 from schemas import (
-    AthenaPayload, Patient, LogEntry, WebSocketMessage, ScraperMode
+    AthenaPayload, IngestBody, Patient, LogEntry, WebSocketMessage, ScraperMode
 )
 from fhir_converter import (
     convert_to_fhir, extract_patient_id, create_log_entry,
@@ -117,23 +127,32 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     BOLD = '\033[1m'
+    # Full escape prefix per level, built once instead of per record
+    # (a plain loop: class-body names aren't visible inside a comprehension)
+    PREFIXES = {}
+    for _level, _color in COLORS.items():
+        PREFIXES[_level] = _color + BOLD
+    del _level, _color
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # No escapes when stdout is piped to journald/docker/a file
+        self.use_color = sys.stdout.isatty()
 
     def format(self, record):
-        color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{color}{self.BOLD}{record.levelname}{self.RESET}"
-        record.msg = f"{color}{record.msg}{self.RESET}"
-        # Make sure standard formatter runs on a string
-        if hasattr(record, 'msg') and not isinstance(record.msg, str):
-            record.msg = str(record.msg)
-        return super().format(record)
+        # Color the formatted line rather than the record, which other handlers share
+        msg = super().format(record)
+        if not self.use_color:
+            return msg
+        return self.PREFIXES.get(record.levelname, self.RESET) + msg + self.RESET
 
 # Configure root logger
 def setup_logging():
     """Setup comprehensive logging for the application."""
 
-    # Create logger
+    # Create logger (LOG_LEVEL=INFO skips the per-request DEBUG diagnostics entirely)
     logger = logging.getLogger("shadow-ehr")
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(os.getenv("LOG_LEVEL", "DEBUG").upper())
 
     # Clear existing handlers
     logger.handlers = []
@@ -146,7 +165,6 @@ def setup_logging():
         datefmt='%H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
     # Rotating file handler for persistent, structured JSON logs
     # Rotates daily, keeps 7 days of logs.
@@ -163,7 +181,6 @@ def setup_logging():
         rename_fields={'levelname': 'level', 'asctime': 'timestamp'}
     )
     file_handler.setFormatter(json_formatter)
-    logger.addHandler(file_handler)
 
     # Add a handler for a separate, non-JSON error log if needed
     error_handler = logging.FileHandler('shadow_ehr.error.log', mode='a')
@@ -173,11 +190,311 @@ def setup_logging():
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     error_handler.setFormatter(error_formatter)
-    logger.addHandler(error_handler)
 
-    return logger
+    # The logger itself only enqueues records; console and file writes happen
+    # on the listener's thread so the event loop never blocks on log I/O.
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(
+        log_queue, console_handler, file_handler, error_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+
+    # logger.success("...") -> INFO with a check mark; bound once here rather than per request
+    logger.success = lambda msg, *args: logger.info("✅ " + msg, *args)
+
+    return logger, listener
+
+logger, log_listener = setup_logging()
+
+# Opt-in dump of payload keys on every /ingest (expensive on large compound payloads)
+TRACE_INGEST = os.getenv("TRACE_INGEST") == "1"
+# Athena compound payload sections worth describing under TRACE_INGEST
+COMPOUND_KEYS = frozenset({'active_medications', 'allergies', 'active_problems', 'measurements', 'demographics'})
+
+# Max patients held in ConnectionManager.patient_cache (and clinical_cache) before LRU eviction
+PATIENT_CACHE_MAX = int(os.getenv("PATIENT_CACHE_MAX", "1000"))
+# A payload identical to one seen this recently (seconds) is stored but not re-converted,
+# re-broadcast or re-interpreted; up to PAYLOAD_DEDUPE_MAX hashes are remembered
+PAYLOAD_DEDUPE_WINDOW = float(os.getenv("PAYLOAD_DEDUPE_WINDOW", "30"))
+PAYLOAD_DEDUPE_MAX = int(os.getenv("PAYLOAD_DEDUPE_MAX", "4096"))
+
+# Max URL patterns kept in ConnectionManager.endpoint_history before LRU eviction
+ENDPOINT_HISTORY_MAX = int(os.getenv("ENDPOINT_HISTORY_MAX", "5000"))
+
+# Max events indexed/interpreted concurrently in background tasks
+DOWNSTREAM_CONCURRENCY = int(os.getenv("DOWNSTREAM_CONCURRENCY", "64"))
+
+# Coalescing window for PATIENT_UPDATE broadcasts (seconds)
+PATIENT_UPDATE_INTERVAL = float(os.getenv("PATIENT_UPDATE_INTERVAL", "0.1"))
+
+# Coalescing window for LOG_ENTRY frames (seconds); a burst within it goes out as one LOG_BATCH
+LOG_BATCH_INTERVAL = float(os.getenv("LOG_BATCH_INTERVAL", "0.02"))
+
+# Largest /ingest body accepted; bigger posts are refused without being parsed
+INGEST_MAX_BYTES = int(os.getenv("INGEST_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# /patients switches to a chunked StreamingResponse at this many cached patients
+PATIENTS_STREAM_THRESHOLD = int(os.getenv("PATIENTS_STREAM_THRESHOLD", "200"))
+
+# Outgoing frames buffered per frontend socket; when full the oldest frame is dropped
+FRONTEND_QUEUE_SIZE = int(os.getenv("FRONTEND_QUEUE_SIZE", "256"))
+
+# A single frontend send taking longer than this (seconds) disconnects the client
+FRONTEND_SEND_TIMEOUT = float(os.getenv("FRONTEND_SEND_TIMEOUT", "1.0"))
+
+# An unchanged Chrome STATUS_UPDATE is re-broadcast at most this often (seconds)
+STATUS_REFRESH_INTERVAL = float(os.getenv("STATUS_REFRESH_INTERVAL", "5.0"))
+
+# /ingest hands payloads to this many worker queues (sharded by patient, so one
+# patient's payloads stay in order); a full queue makes /ingest wait for room
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+
+# Threads running FHIR conversion + LOG_ENTRY encoding, so the event loop keeps
+# reading sockets while a large payload is transformed
+FHIR_WORKERS = int(os.getenv("FHIR_WORKERS", str(min(4, os.cpu_count() or 1))))
+FHIR_POOL = ThreadPoolExecutor(max_workers=FHIR_WORKERS, thread_name_prefix="fhir")
+
+class TracebackSampler:
+    """Token bucket limiting how many full tracebacks the error paths may log."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.last = time.monotonic()
+
+    def should_log(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate / self.per)
+        self.last = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+# At most 10 tracebacks a minute; a misbehaving client can't flood the handlers
+_err_sampler = TracebackSampler(10, 60.0)
+
+def _trunc(s: str, n: int = 100) -> str:
+    """Shorten s to n chars with a trailing ellipsis, returning short strings as-is."""
+    return s if len(s) <= n else s[:n] + '...'
+
+
+# Numeric path segments collapsed to /{id} for endpoint_history grouping
+_ENDPOINT_ID_RE = re.compile(r'/\d+(?=/|$|\?)', re.ASCII)
+
+class _IsoClock:
+    """ISO-8601 'now' at millisecond resolution, formatted at most once per millisecond."""
+
+    def __init__(self, utc: bool):
+        self.utc = utc
+        self.last_ms = 0
+        self.last_iso = ""
+
+    def __call__(self) -> str:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms != self.last_ms:
+            if self.utc:
+                # Naive UTC, same shape as datetime.utcnow().isoformat()
+                dt = datetime.fromtimestamp(now_ms / 1000, timezone.utc).replace(tzinfo=None)
+            else:
+                dt = datetime.fromtimestamp(now_ms / 1000)
+            self.last_ms = now_ms
+            self.last_iso = dt.isoformat(timespec='milliseconds')
+        return self.last_iso
+
+
+# Drop-in replacements for datetime.now().isoformat() / datetime.utcnow().isoformat()
+# on per-event paths; bursts within one millisecond share a single format call
+_fast_iso = _IsoClock(utc=False)
+_fast_utc_iso = _IsoClock(utc=True)
+
+
+# Log separators, built once
+_BANNER = "=" * 60
+_DASH = "-" * 60
+
+# Fixed status messages, serialized once at import
+STATUS_CONNECTED = orjson.dumps({"type": "STATUS_UPDATE", "data": "CONNECTED"})
+STATUS_DISCONNECTED = orjson.dumps({"type": "STATUS_UPDATE", "data": "DISCONNECTED"})
+
+# ============================================================================
+# PATIENT CACHE APPLIERS
+# ============================================================================
+# One function per FHIR record type, dispatched from
+# ConnectionManager.update_patient_cache via _CACHE_APPLIERS. Each returns
+# whether it changed the cache, so no-op events skip the rebuild/broadcast.
+
+def _extend_or_append(target: list, value: Any) -> bool:
+    """Add a list's items, or a single value, to a cache list."""
+    if isinstance(value, list):
+        target.extend(value)
+        return bool(value)
+    target.append(value)
+    return True
+
+
+def _apply_patient(cache: Dict[str, Any], resource: Any) -> bool:
+    cache['patient'] = resource
+    logger.info("  Patient demographics updated")
+    return True
+
+
+def _apply_vital(cache: Dict[str, Any], resource: Any) -> bool:
+    cache['vitals'] = resource
+    logger.info("  Vitals updated")
+    return True
+
+
+def _apply_medication(cache: Dict[str, Any], resource: Any) -> bool:
+    logger.info("  💊 MEDICATION DATA RECEIVED - Type: %s", type(resource).__name__)
+    if isinstance(resource, dict):
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  💊 MEDICATION KEYS: %s", list(resource.keys())[:10])
+        if 'medications' in resource:
+            meds = resource['medications']
+            if meds:
+                _extend_or_append(cache['medications'], meds)
+                logger.info("  ✅ Medications updated (%d total meds)", len(cache['medications']))
+                return True
+            logger.warning("  ⚠️ Empty medications list in response")
+            return False
+        # Try to extract from other keys
+        logger.warning("  ⚠️ No 'medications' key - raw keys: %s", list(resource.keys()))
+        # Store raw for debugging
+        cache['medications'].append(resource)
+        return True
+    if isinstance(resource, list):
+        cache['medications'].extend(resource)
+        logger.info("  ✅ Medications list stored (%d items)", len(resource))
+        return bool(resource)
+    logger.warning("  ⚠️ Unexpected medication format: %s", type(resource))
+    return False
+
+
+def _apply_problem(cache: Dict[str, Any], resource: Any) -> bool:
+    if isinstance(resource, dict) and 'conditions' in resource:
+        cache['problems'] = resource['conditions']
+        logger.info("  Problems updated (%d conditions)", len(cache['problems']))
+        return True
+    return False
+
+
+def _apply_lab(cache: Dict[str, Any], resource: Any) -> bool:
+    changed = _extend_or_append(cache['labs'], resource)
+    logger.info("  Labs updated (%d results)", len(cache['labs']))
+    return changed
+
+
+def _apply_allergy(cache: Dict[str, Any], resource: Any) -> bool:
+    changed = _extend_or_append(cache['allergies'], resource)
+    logger.info("  Allergies updated (%d allergies)", len(cache['allergies']))
+    return changed
+
+
+def _apply_note(cache: Dict[str, Any], resource: Any) -> bool:
+    changed = _extend_or_append(cache['notes'], resource)
+    logger.info("  Notes updated (%d notes)", len(cache['notes']))
+    return changed
+
+
+def _apply_imaging(cache: Dict[str, Any], resource: Any) -> bool:
+    changed = _extend_or_append(cache['imaging'], resource)
+    logger.info("  Imaging updated (%d studies)", len(cache['imaging']))
+    return changed
+
+
+# Compound section -> (cache list it extends, log icon); vitals replace rather than extend
+_COMPOUND_LISTS = (
+    ('medications', 'medications', '💊'),
+    ('labs', 'labs', '🧪'),
+    ('conditions', 'problems', '🩺'),
+    ('allergies', 'allergies', '⚠️'),
+)
+
+
+def _apply_compound(cache: Dict[str, Any], resource: Any) -> bool:
+    # COMPOUND PAYLOAD: Contains multiple data types (medications, vitals, labs, etc.)
+    logger.info("  🔀 COMPOUND PAYLOAD PROCESSING")
+    if not isinstance(resource, dict):
+        return False
+    changed = False
+
+    for src, dst, icon in _COMPOUND_LISTS:
+        value = resource.get(src)
+        if not value:
+            continue
+        changed |= _extend_or_append(cache[dst], value)
+        logger.info("  %s Extracted %d %s from compound", icon, len(value) if isinstance(value, list) else 1, src)
+
+    vitals = resource.get('vitals')
+    if vitals:
+        cache['vitals'] = vitals.model_dump() if hasattr(vitals, 'model_dump') else vitals
+        changed = True
+        logger.info("  📊 Extracted vitals from compound")
+
+    logger.info("  ✅ COMPOUND PAYLOAD PROCESSED SUCCESSFULLY")
+    return changed
+
+
+_CACHE_APPLIERS = {
+    'patient': _apply_patient,
+    'vital': _apply_vital,
+    'medication': _apply_medication,
+    'problem': _apply_problem,
+    'lab': _apply_lab,
+    'allergy': _apply_allergy,
+    'note': _apply_note,
+    'imaging': _apply_imaging,
+    'compound': _apply_compound,
+}
+
+
+@dataclass(slots=True)
+class MedicationSummary:
+    """/clinical/{id}/summary item for an antithrombotic (orjson encodes dataclasses natively)."""
+    name: Optional[str]
+    status: str
+
+
+@dataclass(slots=True)
+class ProblemSummary:
+    """/clinical/{id}/summary item for a vascular diagnosis or CV risk factor."""
+    name: Optional[str]
+    icd10: Optional[str]
+
+
+def _partition_records(partitions: Dict[str, List], category: str, records: List[dict]) -> None:
+    """Append newly interpreted records to the flagged subsets the /clinical endpoints serve."""
+    if category == 'medication':
+        for m in records:
+            if m.get('is_antithrombotic', False):
+                partitions['antithrombotic'].append(m)
+                partitions['antithrombotic_items'].append(MedicationSummary(m.get('name'), m.get('status', 'active')))
+    elif category == 'problem':
+        for p in records:
+            vascular = p.get('is_vascular', False)
+            cv_risk = p.get('is_cardiovascular_risk', False)
+            if vascular or cv_risk:
+                item = ProblemSummary(p.get('display_name'), p.get('icd10_code'))
+                partitions['vascular_or_cv_risk'].append(p)
+            if vascular:
+                partitions['vascular_items'].append(item)
+            if cv_risk:
+                partitions['cv_risk_items'].append(item)
+
+
+def _transform_payload(endpoint: str, method: str, payload: Any, payload_size: int) -> Tuple[str, Any, LogEntry, str]:
+    """CPU-only part of process_athena_payload, run on FHIR_POOL: FHIR conversion and the encoded LOG_ENTRY."""
+    record_type, fhir_resource = convert_to_fhir(endpoint, method, payload)
+    # Size comes from the wire, not from re-stringifying the payload
+    log_entry = create_log_entry(endpoint, method, payload, fhir_resource, payload_size=payload_size)
+    return record_type, fhir_resource, log_entry, log_entry.model_dump_json()
 
-logger = setup_logging()
 
 # ============================================================================
 # CONNECTION MANAGER
@@ -187,28 +504,77 @@ class ConnectionManager:
     """Manages WebSocket connections for Chrome extension and Frontend clients."""
 
     def __init__(self, event_store: EventStore, event_indexer: EventIndexer):
-        # Active connections
-        self.chrome_connections: List[WebSocket] = []
-        self.frontend_connections: List[WebSocket] = []
+        # Active connections (sets: O(1) add/discard under connection churn)
+        self.chrome_connections: Set[WebSocket] = set()
+        self.frontend_connections: Set[WebSocket] = set()
+
+        # Per-frontend outbound queue and the writer task draining it, so broadcasts
+        # never wait on a client's network
+        self.frontend_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.frontend_writers: Dict[WebSocket, asyncio.Task] = {}
 
         # Current scraper mode
         self.mode: ScraperMode = ScraperMode.PASSIVE
 
-        # Patient data cache (in-memory, keyed by patient_id)
-        self.patient_cache: Dict[str, Dict[str, Any]] = {}
+        # Patient data cache (in-memory, keyed by patient_id), kept in LRU order
+        # and capped so a long-running session can't grow without bound
+        self.patient_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.patient_cache_max = PATIENT_CACHE_MAX
+
+        # Patients changed since the last PATIENT_UPDATE flush; the event wakes
+        # the flusher so it sleeps while nothing is pending
+        self.dirty_patients: Set[str] = set()
+        self.dirty_event = asyncio.Event()
+
+        # Encoded LogEntry models awaiting the next LOG_ENTRY/LOG_BATCH frame
+        self.pending_logs: List[bytes] = []
+        self.logs_event = asyncio.Event()
+
+        # Bumped whenever patient_cache contents change (touch_patients) - not on
+        # LRU reordering from reads - and versions the /patients ETag and its
+        # encoded-body cache. The body lists patients in recency order as of the
+        # last content change.
+        self.patients_version = 0
+        self.patients_list_cache: Optional[bytes] = None
+        # Encoded built_patient per patient, valid while built_patient is current;
+        # spliced into PATIENT_UPDATE, /patient/{id} and /patients without re-encoding
+        self.patient_json_cache: Dict[str, bytes] = {}
+
+        # In-flight Layer 2-3 tasks and the cap on how many run at once
+        self.downstream_tasks: Set[asyncio.Task] = set()
+        self.downstream_sem = asyncio.Semaphore(DOWNSTREAM_CONCURRENCY)
+
+        # /ingest payloads awaiting process_athena_payload, one queue per worker
+        self.ingest_queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=INGEST_QUEUE_SIZE) for _ in range(max(1, INGEST_WORKERS))
+        ]
+        # Last patient ID seen on /ingest, in arrival order; ID-less payloads are
+        # stamped with it (and queued on its shard) so attribution doesn't depend
+        # on which worker gets to current_patient_id first
+        self.ingest_context_patient: Optional[str] = None
 
         # Current patient context (for associating data without patient ID in URL)
         self.current_patient_id: Optional[str] = None
 
+        # Last Chrome status sent to frontends, for coalescing repeats
+        self.frontend_status = "DISCONNECTED"
+        self.last_status_at = 0.0
+
         # Statistics
         self.stats = {
             'payloads_received': 0,
             'payloads_processed': 0,
             'errors': 0,
             'patients_cached': 0,
-            'events_indexed': 0
+            'events_indexed': 0,
+            'frontend_frames_dropped': 0,
+            'payloads_deduplicated': 0
         }
 
+        # Content hash -> (monotonic time seen, record type, patient it was applied to)
+        # for recent payloads; Athena polling replays the same responses verbatim within seconds
+        self.recent_payloads: "OrderedDict[bytes, Tuple[float, str, Optional[str]]]" = OrderedDict()
+
         # Event store for raw and interpreted records
         self.event_store = event_store
 
@@ -219,10 +585,28 @@ class ConnectionManager:
         self.interpreter_registry = get_registry()
 
         # Interpreted clinical records cache (patient_id -> category -> records)
-        self.clinical_cache: Dict[str, Dict[str, List]] = {}
+        # Same LRU ordering and cap as patient_cache
+        self.clinical_cache: "OrderedDict[str, Dict[str, List]]" = OrderedDict()
+
+        # Per-patient clinical_cache version, and the /clinical views computed
+        # at a given version (patient_id -> (version, {view_key: response})).
+        # Versions come from one global write counter, so a patient evicted and
+        # re-cached never reuses a version (or ETag) a client may still hold.
+        self.clinical_writes = 0
+        self.clinical_version: Dict[str, int] = {}
+        self.summary_cache: Dict[str, Tuple[int, Dict[Any, Any]]] = {}
+        # Flagged subsets of clinical_cache lists, extended as records are interpreted
+        self.clinical_partitions: Dict[str, Dict[str, List]] = {}
 
         # Endpoint tracking for discovery analysis
-        self.endpoint_history: Dict[str, Dict] = {}  # URL pattern -> {count, methods, sizes, record_type}
+        # URL pattern -> {count, methods, size_total, size_min, size_max, record_type};
+        # sizes are running aggregates so memory stays O(1) per endpoint, and
+        # patterns are LRU-capped so ID shapes the regex misses can't pile up
+        self.endpoint_history: "OrderedDict[str, Dict]" = OrderedDict()
+        # Bumped on every tracked payload; /captured-endpoints reuses its last
+        # sorted response while the version is unchanged
+        self.endpoint_history_version = 0
+        self.captured_endpoints_cache: Tuple[int, Optional[dict]] = (-1, None)
 
         logger.info("ConnectionManager initialized")
         logger.info(f"  Event Indexer: v{INDEXER_VERSION}")
@@ -231,45 +615,50 @@ class ConnectionManager:
     async def connect_chrome(self, websocket: WebSocket):
         """Accept and register a Chrome extension connection."""
         await websocket.accept()
-        self.chrome_connections.append(websocket)
+        self.chrome_connections.add(websocket)
 
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("CHROME EXTENSION CONNECTED")
         logger.info(f"  Remote: {websocket.client}")
         logger.info(f"  Total Chrome connections: {len(self.chrome_connections)}")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
 
         # Notify frontend about Chrome connection
-        await self.broadcast_to_frontend({
-            "type": "STATUS_UPDATE",
-            "data": "CONNECTED"
-        })
+        await self.broadcast_status("CONNECTED")
 
     async def connect_frontend(self, websocket: WebSocket):
         """Accept and register a frontend connection."""
         await websocket.accept()
-        self.frontend_connections.append(websocket)
-
-        logger.info("=" * 60)
+        self.frontend_connections.add(websocket)
+        queue = asyncio.Queue(maxsize=FRONTEND_QUEUE_SIZE)
+        self.frontend_queues[websocket] = queue
+        self.frontend_writers[websocket] = asyncio.create_task(self._frontend_writer(websocket, queue))
+        # Repeats are coalesced, so a late joiner may not see the next one for a while
+        if self.frontend_status == "CONNECTED":
+            queue.put_nowait(STATUS_CONNECTED)
+
+        logger.info(_BANNER)
         logger.info("FRONTEND CLIENT CONNECTED")
         logger.info(f"  Remote: {websocket.client}")
         logger.info(f"  Total frontend connections: {len(self.frontend_connections)}")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
 
     def disconnect_chrome(self, websocket: WebSocket):
         """Remove a Chrome extension connection."""
-        if websocket in self.chrome_connections:
-            self.chrome_connections.remove(websocket)
+        self.chrome_connections.discard(websocket)
 
-        logger.warning("=" * 60)
+        logger.warning(_BANNER)
         logger.warning("CHROME EXTENSION DISCONNECTED")
         logger.warning(f"  Remaining connections: {len(self.chrome_connections)}")
-        logger.warning("=" * 60)
+        logger.warning(_BANNER)
 
     def disconnect_frontend(self, websocket: WebSocket):
         """Remove a frontend connection."""
-        if websocket in self.frontend_connections:
-            self.frontend_connections.remove(websocket)
+        self.frontend_connections.discard(websocket)
+        self.frontend_queues.pop(websocket, None)
+        writer = self.frontend_writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
 
         logger.warning("FRONTEND CLIENT DISCONNECTED")
         logger.warning(f"  Remaining connections: {len(self.frontend_connections)}")
@@ -280,33 +669,62 @@ class ConnectionManager:
             logger.debug("No frontend clients to broadcast to")
             return
 
-        message_str = json.dumps(message)
-        msg_type = message.get('type', 'UNKNOWN')
-        msg_size = len(message_str)
+        # Serialize once; every client gets the same bytes
+        await self.broadcast_bytes_to_frontend(orjson.dumps(message), message.get('type', 'UNKNOWN'))
 
-        logger.debug(f"Broadcasting to {len(self.frontend_connections)} frontend(s): {msg_type} ({msg_size} bytes)")
+    async def broadcast_bytes_to_frontend(self, payload: bytes, msg_type: str = 'PRESERIALIZED'):
+        """Queue an already-serialized JSON message for every connected frontend client."""
+        if not self.frontend_queues:
+            logger.debug("No frontend clients to broadcast to")
+            return
+
+        logger.debug("Broadcasting to %d frontend(s): %s (%d bytes)", len(self.frontend_queues), msg_type, len(payload))
 
-        disconnected = []
-        success_count = 0
+        # Enqueue only: each client's writer task does the send, and a slow
+        # client sheds its oldest frames instead of stalling ingestion
+        for queue in self.frontend_queues.values():
+            if queue.full():
+                queue.get_nowait()
+                self.stats['frontend_frames_dropped'] += 1
+            queue.put_nowait(payload)
+
+    async def broadcast_status(self, status: str):
+        """Broadcast a Chrome STATUS_UPDATE unless the same status went out within STATUS_REFRESH_INTERVAL."""
+        now = time.monotonic()
+        if status == self.frontend_status and now - self.last_status_at < STATUS_REFRESH_INTERVAL:
+            return
+        self.frontend_status = status
+        self.last_status_at = now
+        payload = STATUS_CONNECTED if status == "CONNECTED" else STATUS_DISCONNECTED
+        await self.broadcast_bytes_to_frontend(payload, "STATUS_UPDATE")
 
-        for connection in self.frontend_connections:
+    async def _frontend_writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain one frontend's outbound queue onto its socket until a send fails or stalls."""
+        while True:
+            payload = await queue.get()
             try:
-                await connection.send_text(message_str)
-                success_count += 1
+                await asyncio.wait_for(websocket.send_bytes(payload), timeout=FRONTEND_SEND_TIMEOUT)
+            except asyncio.TimeoutError:
+                # Stuck in TCP retransmit or not reading: shed it rather than buffer for it
+                logger.warning("Frontend send exceeded %.1fs - closing slow client", FRONTEND_SEND_TIMEOUT)
+                self.disconnect_frontend(websocket)
+                try:
+                    await asyncio.wait_for(websocket.close(code=1013), timeout=FRONTEND_SEND_TIMEOUT)
+                except Exception:
+                    pass
+                return
             except Exception as e:
                 logger.error(f"Failed to send to frontend: {e}")
-                disconnected.append(connection)
-
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect_frontend(conn)
+                self.disconnect_frontend(websocket)
+                return
 
-        if success_count > 0:
-            logger.debug(f"Broadcast complete: {success_count}/{len(self.frontend_connections)} successful")
-
-    async def process_athena_payload(self, data: dict):
+    async def process_athena_payload(self, data: dict, wire_size: Optional[int] = None):
         """
         Process incoming AthenaNet payload from Chrome extension.
+
+        payload_size is always the encoded size of the Athena payload itself.
+        wire_size, when given, is the received frame/body length (envelope
+        included) and is recorded alongside it as its own field.
         """
         self.stats['payloads_received'] += 1
 
@@ -314,9 +732,16 @@ class ConnectionManager:
             endpoint = data.get('endpoint', '')
             method = data.get('method', 'GET')
             payload = data.get('payload')
-            payload_size = len(json.dumps(payload)) if payload else 0
+            # Encode once: the same bytes give payload_size, the dedupe hash and the
+            # raw-store line, so the payload is never re-serialized after this
+            try:
+                encoded_payload = orjson.dumps(payload) if payload else None
+            except TypeError:
+                # e.g. ints beyond 64 bits; the event store falls back to stdlib json
+                encoded_payload = None
+            payload_size = len(encoded_payload) if encoded_payload is not None else 0
             status = data.get('status')
-            raw_timestamp = data.get('timestamp') or datetime.utcnow().isoformat()
+            raw_timestamp = data.get('timestamp') or _fast_utc_iso()
             source = data.get('source', 'chrome_interceptor')
 
             # Extract patient ID from multiple locations (active fetch includes it in _meta or raw wrapper)
@@ -331,13 +756,19 @@ class ConnectionManager:
                 if not raw_patient and '_meta' in payload:
                     raw_patient = payload.get('_meta', {}).get('chartId')
 
-            logger.info("-" * 60)
-            logger.info("INCOMING ATHENA PAYLOAD")
-            logger.info(f"  Method: {method}")
-            logger.info(f"  Endpoint: {endpoint[:80]}{'...' if len(endpoint) > 80 else ''}")
-            logger.info(f"  Patient ID (from payload): {raw_patient or 'none'}")
-            logger.info(f"  Payload size: {payload_size} bytes")
-            logger.debug(f"  Raw payload preview: {str(payload)[:200]}...")
+            # One INFO line per payload; the multi-line breakdown is DEBUG
+            logger.info("Athena payload %s %s (patient=%s, %d bytes)",
+                        method, _trunc(endpoint, 80), raw_patient or 'none', payload_size)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_DASH)
+                logger.debug("INCOMING ATHENA PAYLOAD")
+                logger.debug("  Method: %s", method)
+                logger.debug("  Endpoint: %s", _trunc(endpoint, 80))
+                logger.debug("  Patient ID (from payload): %s", raw_patient or 'none')
+                logger.debug("  Payload size: %d bytes", payload_size)
+            # str() of a large payload is expensive; only build the preview when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  Raw payload preview: %.200s...", str(payload))
 
             # Persist the raw payload before any transformation
             raw_event = await self.event_store.append_raw_event({
@@ -347,15 +778,41 @@ class ConnectionManager:
                 'status': status,
                 'patient_id': raw_patient,
                 'payload_size': payload_size,
+                'wire_size': wire_size,
                 'payload': payload,
                 'source': source,
-            })
-            logger.info(f"Raw event stored: {raw_event['id']}")
+            }, encoded_payload=encoded_payload)
+            logger.info("Raw event stored: %s", raw_event['id'])
 
-            # Convert to FHIR
+            # Resolve which patient this event targets: an explicit ID, else (for
+            # passive events) the chart context
+            patient_id = raw_patient or extract_patient_id(endpoint)
+            is_active_fetch = 'active-fetch' in endpoint
+            # Queued /ingest payloads carry the context from when they arrived
+            context_patient = data.get('contextPatientId') or self.current_patient_id
+            target_patient = patient_id or (None if is_active_fetch else context_patient)
+
+            # Verbatim replays are kept in the raw store for provenance, but converting
+            # them again would only re-append the same records downstream. Keyed on the
+            # target, so the same ID-less section for another chart is not a replay.
+            payload_key = self._payload_key(endpoint, method, target_patient, encoded_payload)
+            replay = self._recent_replay(payload_key)
+            if replay is not None:
+                # A replayed chart still marks a chart switch (A -> B -> A): keep
+                # the context in step so later ID-less passive events land right
+                if patient_id:
+                    self.current_patient_id = patient_id
+                self.stats['payloads_deduplicated'] += 1
+                logger.info("Replay of a payload seen in the last %.0fs - skipping conversion", PAYLOAD_DEDUPE_WINDOW)
+                self._track_endpoint(endpoint, method, payload_size, replay)
+                return
+
+            # Convert to FHIR (and build the LOG_ENTRY) on the FHIR pool
             logger.info("Converting to FHIR R4...")
-            record_type, fhir_resource = convert_to_fhir(endpoint, method, payload)
-            logger.info(f"  🏷️  RECORD TYPE DETECTED: {record_type.upper()}")
+            record_type, fhir_resource, log_entry, log_entry_json = await asyncio.get_running_loop().run_in_executor(
+                FHIR_POOL, _transform_payload, endpoint, method, payload, payload_size
+            )
+            logger.info("  🏷️  RECORD TYPE DETECTED: %s", record_type.upper())
 
             # Emit FHIR conversion telemetry
             await emit_telemetry(
@@ -369,284 +826,327 @@ class ConnectionManager:
                 }
             )
             if record_type == 'unknown':
-                logger.warning(f"  ⚠️  UNKNOWN record type - data may not be categorized correctly!")
-                logger.warning(f"  ⚠️  URL: {endpoint[:100]}")
+                logger.warning("  ⚠️  UNKNOWN record type - data may not be categorized correctly!")
+                logger.warning("  ⚠️  URL: %.100s", endpoint)
 
-            # Create log entry for frontend
-            log_entry = create_log_entry(endpoint, method, payload, fhir_resource)
-            logger.debug(f"  Log entry created: {log_entry.id}")
+            logger.debug("  Log entry created: %s", log_entry.id)
 
-            # Send log entry to frontend
-            await self.broadcast_to_frontend({
-                "type": "LOG_ENTRY",
-                "data": log_entry.model_dump()
-            })
-            logger.info("LOG_ENTRY sent to frontend")
-
-            # Extract patient ID and update cache
-            patient_id = raw_patient or extract_patient_id(endpoint)
-            is_active_fetch = 'active-fetch' in endpoint
+            # Queue the log entry for the frontend; bursts go out as one LOG_BATCH frame
+            self.pending_logs.append(log_entry_json)
+            self.logs_event.set()
+            logger.info("LOG_ENTRY queued for frontend")
 
-            logger.info(f"Processing payload. Patient ID: {patient_id}, Is Active Fetch: {is_active_fetch}, Current Context: {self.current_patient_id}")
-            logger.info(f"Cache state BEFORE update: {list(self.patient_cache.keys())}")
+            # Update cache for the resolved patient
+            logger.info("Processing payload. Patient ID: %s, Is Active Fetch: %s, Current Context: %s",
+                        patient_id, is_active_fetch, context_patient)
+            # Listing every cached patient id is O(cache size): DEBUG only
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache state BEFORE update: %s", list(self.patient_cache.keys()))
 
 
             if patient_id:
                 # If a patient ID is present in the payload, it's the source of truth.
                 if is_active_fetch and self.current_patient_id != patient_id:
-                    logger.warning(f"  New active fetch detected. Changing patient context from '{self.current_patient_id}' to '{patient_id}'.")
+                    logger.warning("  New active fetch detected. Changing patient context from '%s' to '%s'.", self.current_patient_id, patient_id)
                 
                 self.current_patient_id = patient_id
                 await self.update_patient_cache(patient_id, record_type, fhir_resource)
+                # Only payloads that reached a cache count as seen: a discarded one
+                # re-sent once the patient is known must still be applied
+                self._remember_payload(payload_key, record_type, patient_id)
             
-            elif self.current_patient_id and not is_active_fetch and record_type != 'unknown':
+            elif context_patient and not is_active_fetch and record_type != 'unknown':
                 # For passive events WITHOUT an ID, use the last known patient context.
-                logger.info(f"  No patient ID in passive event. Using current patient context: {self.current_patient_id}")
-                await self.update_patient_cache(self.current_patient_id, record_type, fhir_resource)
+                logger.info("  No patient ID in passive event. Using current patient context: %s", context_patient)
+                await self.update_patient_cache(context_patient, record_type, fhir_resource)
+                self._remember_payload(payload_key, record_type, context_patient)
             
             else:
                 # Discard if we have no context, or if it's an active fetch without an ID (which is an error state).
-                logger.warning(f"  Could not determine patient context for this event. Discarding.")
-                logger.warning(f"    - Endpoint: {endpoint}")
-                logger.warning(f"    - Is Active Fetch: {is_active_fetch}")
-                logger.warning(f"    - Current Context: {self.current_patient_id}")
-
-            # Index event using Layer 2 Event Indexer (replaces simple append_index_entry)
-            # The indexer provides:
-            #   - More accurate clinical category classification
-            #   - Extraction hints for downstream interpreters
-            #   - Confidence scores for classification quality
-            #   - Source type detection (passive vs active fetch)
-            index_entry = await self.event_indexer.index_event({
-                'id': raw_event['id'],
-                'endpoint': endpoint,
-                'payload': payload,
-                'timestamp': raw_event['timestamp'],
-                'patient_id': patient_id or self.current_patient_id,
-            })
-            self.stats['events_indexed'] += 1
-            logger.debug(f"  Indexed as: {index_entry.category}/{index_entry.subcategory or '-'} (conf={index_entry.confidence:.2f})")
-
-            # Layer 3: Clinical Interpretation
-            # Run interpreters on indexed events to extract clinical meaning
-            interpretation_results = self.interpreter_registry.interpret_event(
-                raw_event={'id': raw_event['id'], 'payload': payload, 'endpoint': endpoint},
-                index_entry=index_entry.to_dict()
-            )
+                logger.warning("  Could not determine patient context for this event. Discarding.")
+                logger.warning("    - Endpoint: %s", endpoint)
+                logger.warning("    - Is Active Fetch: %s", is_active_fetch)
+                logger.warning("    - Current Context: %s", context_patient)
 
-            # Cache interpreted results by patient and category
-            if interpretation_results and (patient_id or self.current_patient_id):
-                pid = patient_id or self.current_patient_id
-                if pid not in self.clinical_cache:
-                    self.clinical_cache[pid] = {'medication': [], 'problem': [], 'vital': [], 'allergy': []}
-
-                for result in interpretation_results:
-                    category = result.category
-                    if category in self.clinical_cache[pid]:
-                        self.clinical_cache[pid][category].extend(result.records)
-                        logger.info(f"  🔬 Interpreted {len(result.records)} {category}(s) for patient {pid}")
-
-                        # Broadcast clinical update to frontend
-                        await self.broadcast_to_frontend({
-                            "type": "CLINICAL_UPDATE",
-                            "data": {
-                                "patient_id": pid,
-                                "category": category,
-                                "records": result.records,
-                                "interpreter_version": result.interpreter_version,
-                                "confidence": result.confidence
-                            }
-                        })
+            # Layers 2-3 (indexing, interpretation, CLINICAL_UPDATE_BATCH) run as a background
+            # task: only raw storage and FHIR conversion have to finish before the ack
+            self.spawn_downstream(raw_event, endpoint, payload, patient_id or context_patient)
 
             # Track endpoint for discovery analysis
-            import re
-            normalized_endpoint = re.sub(r'/\d+(?=/|$|\?)', '/{id}', endpoint)
-            if normalized_endpoint not in self.endpoint_history:
-                self.endpoint_history[normalized_endpoint] = {
-                    'count': 0, 'methods': set(), 'sizes': [], 'record_type': record_type
-                }
-            self.endpoint_history[normalized_endpoint]['count'] += 1
-            self.endpoint_history[normalized_endpoint]['methods'].add(method)
-            self.endpoint_history[normalized_endpoint]['sizes'].append(payload_size)
+            self._track_endpoint(endpoint, method, payload_size, record_type)
 
             self.stats['payloads_processed'] += 1
-            logger.info(f"Payload processed successfully (Total: {self.stats['payloads_processed']})")
+            logger.info("Payload processed successfully (Total: %d)", self.stats['payloads_processed'])
 
         except Exception as e:
             self.stats['errors'] += 1
-            logger.error("=" * 60)
+            logger.error(_BANNER)
             logger.error("ERROR PROCESSING PAYLOAD")
-            logger.error(f"  Error: {str(e)}")
-            logger.error(f"  Total errors: {self.stats['errors']}")
-            logger.exception("Full traceback:")
-            logger.error("=" * 60)
+            logger.error("  Error: %s", e)
+            logger.error("  Total errors: %d", self.stats['errors'])
+            if _err_sampler.should_log():
+                logger.exception("Full traceback:")
+            logger.error(_BANNER)
+
+    @staticmethod
+    def _payload_key(endpoint: str, method: str, patient: Any, encoded_payload: Optional[bytes]) -> Optional[bytes]:
+        """Short content hash identifying a payload from its encoded bytes, or None if there are none."""
+        if encoded_payload is None:
+            return None
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(f"{method}\0{endpoint}\0{patient}\0".encode())
+        digest.update(encoded_payload)
+        return digest.digest()
+
+    def _recent_replay(self, key: Optional[bytes]) -> Optional[str]:
+        """Record type of the identical payload seen within PAYLOAD_DEDUPE_WINDOW, if any."""
+        if key is None:
+            return None
+        seen = self.recent_payloads.get(key)
+        if seen is None or time.monotonic() - seen[0] > PAYLOAD_DEDUPE_WINDOW:
+            return None
+        return seen[1]
+
+    def _remember_payload(self, key: Optional[bytes], record_type: str, patient_id: Optional[str]):
+        if key is None:
+            return
+        self.recent_payloads[key] = (time.monotonic(), record_type, patient_id)
+        self.recent_payloads.move_to_end(key)
+        if len(self.recent_payloads) > PAYLOAD_DEDUPE_MAX:
+            self.recent_payloads.popitem(last=False)
+
+    def _forget_payloads(self, patient_id: str):
+        """Drop dedupe entries for an evicted patient so a reload rebuilds its cache."""
+        stale = [key for key, seen in self.recent_payloads.items() if seen[2] == patient_id]
+        for key in stale:
+            del self.recent_payloads[key]
+
+    def _track_endpoint(self, endpoint: str, method: str, payload_size: int, record_type: str):
+        """Fold one request into endpoint_history (discovery analysis)."""
+        normalized_endpoint = _ENDPOINT_ID_RE.sub('/{id}', endpoint)
+        history = self.endpoint_history.get(normalized_endpoint)
+        if history is None:
+            history = self.endpoint_history[normalized_endpoint] = {
+                'count': 0, 'methods': set(), 'size_total': 0,
+                'size_min': payload_size, 'size_max': payload_size, 'record_type': record_type
+            }
+            if len(self.endpoint_history) > ENDPOINT_HISTORY_MAX:
+                evicted_pattern, _ = self.endpoint_history.popitem(last=False)
+                logger.debug("Endpoint history full (%d) - evicted %s", ENDPOINT_HISTORY_MAX, evicted_pattern)
+        else:
+            self.endpoint_history.move_to_end(normalized_endpoint)
+        history['count'] += 1
+        history['methods'].add(method)
+        history['size_total'] += payload_size
+        if payload_size < history['size_min']:
+            history['size_min'] = payload_size
+        elif payload_size > history['size_max']:
+            history['size_max'] = payload_size
+        self.endpoint_history_version += 1
+
+    async def enqueue_ingest(self, payload: Dict[str, Any], wire_size: int):
+        """
+        Queue an /ingest payload for the worker owning its patient, waiting while
+        that queue is full so per-patient order is never broken by an overtaking payload.
+        """
+        patient = payload.get('patientId') or extract_patient_id(payload.get('endpoint', ''))
+        if patient:
+            self.ingest_context_patient = patient
+        else:
+            # Passive event: belongs to the chart open when it arrived, behind that
+            # chart's own payloads in the same queue
+            payload['contextPatientId'] = self.ingest_context_patient
+            patient = self.ingest_context_patient
+        queue = self.ingest_queues[hash(patient) % len(self.ingest_queues)]
+        if queue.full():
+            logger.warning("Ingest queue full (%d) - holding /ingest until a worker catches up", INGEST_QUEUE_SIZE)
+        await queue.put((payload, wire_size))
+
+    async def run_ingest_worker(self, queue: asyncio.Queue):
+        """Background loop (started in lifespan) processing one shard of queued /ingest payloads."""
+        while True:
+            payload, wire_size = await queue.get()
+            try:
+                await self.process_athena_payload(payload, wire_size=wire_size)
+            except Exception as e:
+                logger.error("Queued ingest processing failed: %s", e)
+            finally:
+                queue.task_done()
+
+    async def drain_ingest(self):
+        """Wait until every queued /ingest payload has been processed."""
+        for queue in self.ingest_queues:
+            await queue.join()
+
+    def spawn_downstream(self, raw_event: Dict[str, Any], endpoint: str, payload: Any, patient_id: Optional[str]):
+        """Run indexing/interpretation for a stored raw event without blocking the caller."""
+        task = asyncio.create_task(self._process_downstream(raw_event, endpoint, payload, patient_id))
+        # Hold a reference until done so the task isn't garbage-collected mid-flight
+        self.downstream_tasks.add(task)
+        task.add_done_callback(self.downstream_tasks.discard)
+
+    async def _process_downstream(self, raw_event: Dict[str, Any], endpoint: str, payload: Any, patient_id: Optional[str]):
+        """Layers 2-3 for one event; bounded by downstream_sem, errors logged and swallowed."""
+        async with self.downstream_sem:
+            try:
+                # Index event using Layer 2 Event Indexer (replaces simple append_index_entry)
+                # The indexer provides:
+                #   - More accurate clinical category classification
+                #   - Extraction hints for downstream interpreters
+                #   - Confidence scores for classification quality
+                #   - Source type detection (passive vs active fetch)
+                index_entry = await self.event_indexer.index_event({
+                    'id': raw_event['id'],
+                    'endpoint': endpoint,
+                    'payload': payload,
+                    'timestamp': raw_event['timestamp'],
+                    'patient_id': patient_id,
+                })
+                self.stats['events_indexed'] += 1
+                logger.debug("  Indexed as: %s/%s (conf=%.2f)", index_entry.category, index_entry.subcategory or '-', index_entry.confidence)
+
+                # Layer 3: Clinical Interpretation
+                # Run interpreters on indexed events to extract clinical meaning
+                interpretation_results = self.interpreter_registry.interpret_event(
+                    raw_event={'id': raw_event['id'], 'payload': payload, 'endpoint': endpoint},
+                    index_entry=index_entry.to_dict()
+                )
+
+                # Cache interpreted results by patient and category
+                if interpretation_results and patient_id:
+                    pid = patient_id
+                    if pid not in self.clinical_cache:
+                        self.clinical_cache[pid] = {'medication': [], 'problem': [], 'vital': [], 'allergy': []}
+                        while len(self.clinical_cache) > self.patient_cache_max:
+                            evicted_id, _ = self.clinical_cache.popitem(last=False)
+                            self.clinical_version.pop(evicted_id, None)
+                            self.summary_cache.pop(evicted_id, None)
+                            self.clinical_partitions.pop(evicted_id, None)
+                            logger.info("Clinical cache full (%d) - evicted LRU patient %s", self.patient_cache_max, evicted_id)
+                    else:
+                        self.clinical_cache.move_to_end(pid)
+                    # Local ref: a concurrent task may evict pid while we await broadcasts
+                    clinical = self.clinical_cache[pid]
+                    partitions = self.clinical_partitions.setdefault(pid, {
+                        'antithrombotic': [], 'vascular_or_cv_risk': [],
+                        'antithrombotic_items': [], 'vascular_items': [], 'cv_risk_items': []
+                    })
+
+                    clinical_updates = []
+                    for result in interpretation_results:
+                        category = result.category
+                        if category in clinical:
+                            clinical[category].extend(result.records)
+                            _partition_records(partitions, category, result.records)
+                            logger.info("  🔬 Interpreted %d %s(s) for patient %s", len(result.records), category, pid)
+                            clinical_updates.append({
+                                "category": category,
+                                "records": result.records,
+                                "interpreter_version": result.interpreter_version,
+                                "confidence": result.confidence
+                            })
+
+                    # One broadcast per event, however many categories were interpreted
+                    if clinical_updates:
+                        self.clinical_writes += 1
+                        self.clinical_version[pid] = self.clinical_writes
+                        await self.broadcast_to_frontend({
+                            "type": "CLINICAL_UPDATE_BATCH",
+                            "data": {
+                                "patient_id": pid,
+                                "updates": clinical_updates
+                            }
+                        })
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error("Downstream processing failed for event %s: %s", raw_event['id'], e)
+                if _err_sampler.should_log():
+                    logger.exception("Full traceback:")
+
+    def clinical_view(self, patient_id: str, key: Any, build: Callable[[], Any]) -> Any:
+        """Return a /clinical response computed from clinical_cache, memoized until the patient's next write."""
+        version = self.clinical_version.get(patient_id, 0)
+        entry = self.summary_cache.get(patient_id)
+        if entry is None or entry[0] != version:
+            entry = self.summary_cache[patient_id] = (version, {})
+        views = entry[1]
+        if key not in views:
+            views[key] = build()
+        return views[key]
+
+    def clinical_etag(self, patient_id: str) -> str:
+        """Weak ETag for responses derived from a patient's clinical_cache entry."""
+        return f'W/"{patient_id}-{self.clinical_version.get(patient_id, 0)}"'
+
+    def touch_patients(self):
+        """Record a patient_cache change: new /patients ETag, cached body dropped."""
+        self.patients_version += 1
+        self.patients_list_cache = None
+
+    def get_or_build_context(self, patient_id: str) -> ClinicalContext:
+        """ClinicalContext for a patient in clinical_cache, rebuilt only after new interpreter output."""
+        def build():
+            cache = self.clinical_cache[patient_id]
+            return generate_context(patient_id, cache.get('medication', []), cache.get('problem', []))
+        return self.clinical_view(patient_id, ('context',), build)
 
     async def update_patient_cache(self, patient_id: str, record_type: str, fhir_resource: Any):
         """Update the patient cache with new data and emit patient update."""
 
-        logger.info(f"Updating cache for patient {patient_id} with record type {record_type}.")
+        logger.info("Updating cache for patient %s with record type %s.", patient_id, record_type)
         is_new_patient = patient_id not in self.patient_cache
 
         if is_new_patient:
-            self.patient_cache[patient_id] = {
+            entry = {
                 'patient': None,
                 'vitals': None,
                 'medications': [],
                 'problems': [],
                 'labs': [],
                 'allergies': [],
-                'allergy': [],
                 'documents': [],
                 'notes': [],
-                'note': [],
                 'procedures': [],
                 'imaging': [],
                 'unknown': [],  # Store unclassified data for debugging
                 'last_update': None
             }
+            # Singular keys stay for existing raw-cache readers; they alias the same
+            # list objects, so each record is stored once
+            entry['allergy'] = entry['allergies']
+            entry['note'] = entry['notes']
+            self.patient_cache[patient_id] = entry
             self.stats['patients_cached'] += 1
-            logger.info(f"NEW PATIENT ADDED TO CACHE: {patient_id}")
-            logger.info(f"Cache state AFTER adding new patient: {list(self.patient_cache.keys())}")
+            logger.info("NEW PATIENT ADDED TO CACHE: %s", patient_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache state AFTER adding new patient: %s", list(self.patient_cache.keys()))
+            while len(self.patient_cache) > self.patient_cache_max:
+                evicted_id, _ = self.patient_cache.popitem(last=False)
+                self.patient_json_cache.pop(evicted_id, None)
+                self._forget_payloads(evicted_id)
+                logger.info("Patient cache full (%d) - evicted LRU patient %s", self.patient_cache_max, evicted_id)
+        else:
+            self.patient_cache.move_to_end(patient_id)
 
         cache = self.patient_cache[patient_id]
 
-        # Update appropriate section
-        logger.debug(f"Updating cache section: {record_type}")
-
-        if record_type == 'patient':
-            if hasattr(fhir_resource, 'dict'):
-                cache['patient'] = fhir_resource.model_dump()
-            else:
-                cache['patient'] = fhir_resource
-            logger.info(f"  Patient demographics updated")
-
-        elif record_type == 'vital':
-            if hasattr(fhir_resource, 'dict'):
-                cache['vitals'] = fhir_resource.model_dump()
-            else:
-                cache['vitals'] = fhir_resource
-            logger.info(f"  Vitals updated")
-
-        elif record_type == 'medication':
-            logger.info(f"  💊 MEDICATION DATA RECEIVED - Type: {type(fhir_resource).__name__}")
-            if isinstance(fhir_resource, dict):
-                logger.info(f"  💊 MEDICATION KEYS: {list(fhir_resource.keys())[:10]}")
-                if 'medications' in fhir_resource:
-                    meds = fhir_resource['medications']
-                    if meds:
-                        cache['medications'].extend(meds) if isinstance(meds, list) else cache['medications'].append(meds)
-                        logger.info(f"  ✅ Medications updated ({len(cache['medications'])} total meds)")
-                    else:
-                        logger.warning(f"  ⚠️ Empty medications list in response")
-                else:
-                    # Try to extract from other keys
-                    logger.warning(f"  ⚠️ No 'medications' key - raw keys: {list(fhir_resource.keys())}")
-                    # Store raw for debugging
-                    cache['medications'].append(fhir_resource)
-            elif isinstance(fhir_resource, list):
-                cache['medications'].extend(fhir_resource)
-                logger.info(f"  ✅ Medications list stored ({len(fhir_resource)} items)")
-            else:
-                logger.warning(f"  ⚠️ Unexpected medication format: {type(fhir_resource)}")
-
-        elif record_type == 'problem':
-            if isinstance(fhir_resource, dict) and 'conditions' in fhir_resource:
-                cache['problems'] = fhir_resource['conditions']
-                logger.info(f"  Problems updated ({len(cache['problems'])} conditions)")
-
-        elif record_type == 'lab':
-            # Store lab results
-            if isinstance(fhir_resource, list):
-                cache['labs'].extend(fhir_resource)
-            else:
-                cache['labs'].append(fhir_resource)
-            logger.info(f"  Labs updated ({len(cache['labs'])} results)")
-
-        elif record_type == 'allergy':
-            # Store allergies
-            if isinstance(fhir_resource, list):
-                cache['allergies'].extend(fhir_resource)
-                cache['allergy'].extend(fhir_resource)
-            else:
-                cache['allergies'].append(fhir_resource)
-                cache['allergy'].append(fhir_resource)
-            logger.info(f"  Allergies updated ({len(cache['allergies'])} allergies)")
-
-        elif record_type == 'note':
-            # Store notes
-            if isinstance(fhir_resource, list):
-                cache['notes'].extend(fhir_resource)
-                cache['note'].extend(fhir_resource)
-            else:
-                cache['notes'].append(fhir_resource)
-                cache['note'].append(fhir_resource)
-            logger.info(f"  Notes updated ({len(cache['notes'])} notes)")
-
-        elif record_type == 'imaging':
-            # Store imaging
-            if isinstance(fhir_resource, list):
-                cache['imaging'].extend(fhir_resource)
-            else:
-                cache['imaging'].append(fhir_resource)
-            logger.info(f"  Imaging updated ({len(cache['imaging'])} studies)")
-
-        elif record_type == 'compound':
-            # COMPOUND PAYLOAD: Contains multiple data types (medications, vitals, labs, etc.)
-            logger.info(f"  🔀 COMPOUND PAYLOAD PROCESSING")
-            if isinstance(fhir_resource, dict):
-                # Extract medications
-                if 'medications' in fhir_resource and fhir_resource['medications']:
-                    meds = fhir_resource['medications']
-                    if isinstance(meds, list):
-                        cache['medications'].extend(meds)
-                    else:
-                        cache['medications'].append(meds)
-                    logger.info(f"  💊 Extracted {len(meds) if isinstance(meds, list) else 1} medications from compound")
-
-                # Extract vitals
-                if 'vitals' in fhir_resource and fhir_resource['vitals']:
-                    vitals = fhir_resource['vitals']
-                    if hasattr(vitals, 'dict'):
-                        cache['vitals'] = vitals.model_dump()
-                    else:
-                        cache['vitals'] = vitals
-                    logger.info(f"  📊 Extracted vitals from compound")
-
-                # Extract labs
-                if 'labs' in fhir_resource and fhir_resource['labs']:
-                    labs = fhir_resource['labs']
-                    if isinstance(labs, list):
-                        cache['labs'].extend(labs)
-                    else:
-                        cache['labs'].append(labs)
-                    logger.info(f"  🧪 Extracted {len(labs) if isinstance(labs, list) else 1} labs from compound")
-
-                # Extract conditions/problems
-                if 'conditions' in fhir_resource and fhir_resource['conditions']:
-                    conditions = fhir_resource['conditions']
-                    if isinstance(conditions, list):
-                        cache['problems'].extend(conditions)
-                    else:
-                        cache['problems'].append(conditions)
-                    logger.info(f"  🩺 Extracted {len(conditions) if isinstance(conditions, list) else 1} conditions from compound")
-
-                # Extract allergies
-                if 'allergies' in fhir_resource and fhir_resource['allergies']:
-                    allergies = fhir_resource['allergies']
-                    if isinstance(allergies, list):
-                        cache['allergies'].extend(allergies)
-                        cache['allergy'].extend(allergies)
-                    else:
-                        cache['allergies'].append(allergies)
-                        cache['allergy'].append(allergies)
-                    logger.info(f"  ⚠️ Extracted {len(allergies) if isinstance(allergies, list) else 1} allergies from compound")
-
-                logger.info(f"  ✅ COMPOUND PAYLOAD PROCESSED SUCCESSFULLY")
+        # Pydantic resources (patient, vitals) are stored as plain dicts
+        if isinstance(fhir_resource, BaseModel):
+            fhir_resource = fhir_resource.model_dump()
 
+        # Update appropriate section
+        logger.debug("Updating cache section: %s", record_type)
+
+        applier = _CACHE_APPLIERS.get(record_type)
+        if applier is not None:
+            if not applier(cache, fhir_resource) and not is_new_patient:
+                # Nothing new: no rebuild or PATIENT_UPDATE needed
+                logger.debug("  No cache change for %s (%s) - skipping rebuild", patient_id, record_type)
+                return
         else:
             # Store unknown types for debugging
             cache['unknown'].append({'type': record_type, 'data': fhir_resource})
-            logger.debug(f"  Unknown record type '{record_type}' stored")
+            logger.debug("  Unknown record type '%s' stored", record_type)
 
             # POST-PROCESS: Extract patient data from unknown items if cache['patient'] is empty
             if isinstance(fhir_resource, dict):
@@ -654,10 +1154,10 @@ class ConnectionManager:
                 patient_data = fhir_resource.get('patient')
                 if patient_data and isinstance(patient_data, dict) and not cache.get('patient'):
                     # Found patient data in unknown - extract it!
-                    logger.info(f"  🔍 RECOVERED patient data from unknown: {patient_data.get('LastName', 'Unknown')}")
+                    logger.info("  🔍 RECOVERED patient data from unknown: %s", patient_data.get('LastName', 'Unknown'))
                     cache['patient'] = patient_data
 
-        cache['last_update'] = datetime.now().isoformat()
+        cache['last_update'] = _fast_iso()
 
         # FINAL RECOVERY: If cache['patient'] still empty, scan all unknown items
         if not cache.get('patient'):
@@ -669,14 +1169,14 @@ class ConnectionManager:
                         if 'patient' in data:
                             patient_info = data['patient']
                             if isinstance(patient_info, dict) and patient_info.get('LastName'):
-                                logger.info(f"  🔍 RECOVERED patient from unknown scan: {patient_info.get('LastName')}")
+                                logger.info("  🔍 RECOVERED patient from unknown scan: %s", patient_info.get('LastName'))
                                 cache['patient'] = patient_info
                                 break
                         # Check for 'available_contacts_and_consents' key (Athena UPPERCASE format)
                         if 'available_contacts_and_consents' in data:
                             contacts = data['available_contacts_and_consents']
                             if isinstance(contacts, dict) and (contacts.get('FIRSTNAME') or contacts.get('LASTNAME')):
-                                logger.info(f"  🔍 RECOVERED patient from available_contacts_and_consents: {contacts.get('FIRSTNAME')} {contacts.get('LASTNAME')}")
+                                logger.info("  🔍 RECOVERED patient from available_contacts_and_consents: %s %s", contacts.get('FIRSTNAME'), contacts.get('LASTNAME'))
                                 cache['patient'] = {
                                     'FirstName': contacts.get('FIRSTNAME', ''),
                                     'LastName': contacts.get('LASTNAME', ''),
@@ -684,8 +1184,16 @@ class ConnectionManager:
                                 }
                                 break
 
-        # Build and emit patient update
-        patient = build_patient_from_aggregated_data(
+        # Build + broadcast is coalesced: run_patient_flusher emits at most one
+        # PATIENT_UPDATE per patient per PATIENT_UPDATE_INTERVAL, however many
+        # records arrive in between
+        self.dirty_patients.add(patient_id)
+        self.dirty_event.set()
+        self.touch_patients()
+
+    def _build_patient(self, patient_id: str, cache: Dict[str, Any]) -> Patient:
+        """Aggregate a cache entry into the frontend Patient shape."""
+        return build_patient_from_aggregated_data(
             patient_id=patient_id,
             patient_data=cache.get('patient'),
             vitals_data=cache.get('vitals'),
@@ -694,19 +1202,99 @@ class ConnectionManager:
             unknown_data=cache.get('unknown')
         )
 
-        logger.info("=" * 60)
-        logger.info("EMITTING PATIENT UPDATE TO FRONTEND")
-        logger.info(f"  Patient ID: {patient_id}")
-        logger.info(f"  Name: {patient.name}")
-        logger.info(f"  MRN: {patient.mrn}")
-        logger.info(f"  Conditions: {len(patient.conditions)}")
-        logger.info(f"  Medications: {len(patient.medications)}")
-        logger.info(f"  Vitals: BP={patient.vitals.bp}, HR={patient.vitals.hr}")
-        logger.info("=" * 60)
+    def get_built_patient(self, patient_id: str) -> Dict[str, Any]:
+        """Current frontend shape for a cached patient, built now if an update is still pending."""
+        cache = self.patient_cache[patient_id]
+        if patient_id in self.dirty_patients or 'built_patient' not in cache:
+            return self._build_patient(patient_id, cache).model_dump()
+        return cache['built_patient']
+
+    def get_patient_json(self, patient_id: str) -> bytes:
+        """Encoded frontend shape for a cached patient, reused until the next rebuild."""
+        body = self.patient_json_cache.get(patient_id)
+        if body is not None and patient_id not in self.dirty_patients:
+            return body
+        body = orjson.dumps(self.get_built_patient(patient_id))
+        # Only a flushed build is stable enough to keep; pending updates rebuild next read
+        if patient_id not in self.dirty_patients:
+            self.patient_json_cache[patient_id] = body
+        return body
+
+    async def flush_patient_updates(self):
+        """Build and broadcast every patient changed since the last flush."""
+        patient_ids, self.dirty_patients = self.dirty_patients, set()
+        for patient_id in patient_ids:
+            cache = self.patient_cache.get(patient_id)
+            if cache is None:
+                continue  # Evicted before the flush
+            await self._emit_patient_update(patient_id, cache)
+
+    async def run_patient_flusher(self):
+        """Background loop (started in lifespan) draining dirty_patients once per coalescing window."""
+        while True:
+            await self.dirty_event.wait()
+            # Let the rest of a burst land before building, then take everything pending
+            await asyncio.sleep(PATIENT_UPDATE_INTERVAL)
+            self.dirty_event.clear()
+            try:
+                await self.flush_patient_updates()
+            except Exception as e:
+                logger.error(f"Patient update flush failed: {e}")
+
+    async def flush_log_entries(self):
+        """Broadcast queued log entries: a lone entry as LOG_ENTRY, several as one LOG_BATCH."""
+        entries, self.pending_logs = self.pending_logs, []
+        if not entries:
+            return
+        # pydantic-core already encoded each LogEntry; splice the bytes in as-is
+        if len(entries) == 1:
+            await self.broadcast_bytes_to_frontend(
+                b'{"type":"LOG_ENTRY","data":' + entries[0] + b'}', "LOG_ENTRY")
+        else:
+            await self.broadcast_bytes_to_frontend(
+                b'{"type":"LOG_BATCH","data":[' + b','.join(entries) + b']}', "LOG_BATCH")
+
+    async def run_log_flusher(self):
+        """Background loop (started in lifespan) sending pending_logs once per LOG_BATCH_INTERVAL."""
+        while True:
+            await self.logs_event.wait()
+            await asyncio.sleep(LOG_BATCH_INTERVAL)
+            self.logs_event.clear()
+            try:
+                await self.flush_log_entries()
+            except Exception as e:
+                logger.error(f"Log entry flush failed: {e}")
+
+    async def _emit_patient_update(self, patient_id: str, cache: Dict[str, Any]):
+        """Rebuild one patient and broadcast PATIENT_UPDATE if the view changed."""
+        patient = self._build_patient(patient_id, cache)
+
+        # Materialize the frontend shape once per flush; read endpoints serve this directly
+        built = patient.model_dump()
+        if built == cache.get('built_patient'):
+            # e.g. a resent problem list or unknown item that doesn't change the view
+            logger.debug("  Built patient unchanged for %s - skipping PATIENT_UPDATE", patient_id)
+            return
+        cache['built_patient'] = built
+        # Encode the patient once: the same bytes back the PATIENT_UPDATE frame
+        # and the /patient/{id} and /patients bodies
+        built_json = orjson.dumps(built)
+        self.patient_json_cache[patient_id] = built_json
+
+        logger.info("PATIENT_UPDATE %s (%d conditions, %d medications)",
+                    patient_id, len(patient.conditions), len(patient.medications))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_BANNER)
+            logger.debug("EMITTING PATIENT UPDATE TO FRONTEND")
+            logger.debug("  Patient ID: %s", patient_id)
+            logger.debug("  Name: %s", patient.name)
+            logger.debug("  MRN: %s", patient.mrn)
+            logger.debug("  Vitals: BP=%s, HR=%s", patient.vitals.bp, patient.vitals.hr)
+            logger.debug(_BANNER)
 
         await self.broadcast_to_frontend({
             "type": "PATIENT_UPDATE",
-            "data": patient.model_dump()
+            "data": orjson.Fragment(built_json)
         })
 
         # Emit WebSocket broadcast telemetry
@@ -760,9 +1348,9 @@ set_broadcast_function(manager.broadcast_to_frontend)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     logger.info("  SHADOW EHR BACKEND STARTING")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     logger.info("WebSocket Endpoints:")
     logger.info("  Chrome Extension: ws://localhost:8000/ws/chrome")
     logger.info("  React Frontend:   ws://localhost:8000/ws/frontend")
@@ -772,13 +1360,43 @@ async def lifespan(app: FastAPI):
     logger.info("  Status:           http://localhost:8000/")
     logger.info("  Patients:         http://localhost:8000/patients")
     logger.info("  Stats:            http://localhost:8000/stats")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
+    # Patient cache and WebSocket registries live in this process only;
+    # extra workers would each see a disjoint slice of the traffic.
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+        logger.warning("WEB_CONCURRENCY > 1: state is per-process, run a single worker")
+    # Build lazy singletons now so the first request doesn't pay for construction.
+    # Detector before index: get_artifact_detector() owns creation of the shared index.
+    get_summarizer()
+    get_vascular_extractor()
+    get_artifact_detector()
+    get_artifact_index()
+    orjson.dumps({"type": "WARMUP"})
+    logger.info("Prewarmed summarizer, vascular extractor and artifact detector")
+    patient_flusher = asyncio.create_task(manager.run_patient_flusher())
+    log_flusher = asyncio.create_task(manager.run_log_flusher())
+    ingest_workers = [asyncio.create_task(manager.run_ingest_worker(q)) for q in manager.ingest_queues]
     logger.info("Waiting for connections...")
     logger.info("")
     yield
-    logger.info("=" * 60)
+    # Finish payloads /ingest already acknowledged before stopping the workers
+    try:
+        await asyncio.wait_for(manager.drain_ingest(), timeout=10.0)
+    except asyncio.TimeoutError:
+        logger.warning("Ingest queue not drained within 10s - dropping remaining payloads")
+    for worker in ingest_workers:
+        worker.cancel()
+    patient_flusher.cancel()
+    log_flusher.cancel()
+    FHIR_POOL.shutdown(wait=False)
+    get_narrative_engine()._llm_pool.shutdown(wait=False)
+    # Write out raw events still queued in the event store
+    await event_store.flush()
+    logger.info(_BANNER)
     logger.info("  SHADOW EHR BACKEND SHUTTING DOWN")
-    logger.info("=" * 60)
+    logger.info(_BANNER)
+    # Flushes any queued records before the process exits
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -786,7 +1404,9 @@ app = FastAPI(
     title="Shadow EHR Backend",
     description="Normalization Engine for AthenaNet data interception",
     version="0.9.2",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Serialize every endpoint's dict response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for REST endpoints - allow all localhost ports for dev
@@ -830,7 +1450,7 @@ async def root():
 async def health():
     """Simple health check endpoint."""
     logger.debug("Health check")
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": _fast_iso()}
 
 
 @app.get("/stats")
@@ -861,6 +1481,27 @@ async def indexed_events(patient_id: Optional[str] = None, limit: int = 50):
     }
 # ... inside the FastAPI app ...
 
+def narrative_input(patient_id: str) -> Optional[Dict[str, Any]]:
+    """Raw cache for the narrative engine, with interpreted (Layer 3) lists merged in."""
+    # 1. ABSORB: Get Raw Data from Cache
+    if patient_id not in manager.patient_cache:
+        return None
+
+    raw_cache = manager.patient_cache[patient_id]
+
+    # Optional: Merge Interpreted Data (Layer 3) into a copy - writing into the
+    # live entry would alias clinical_cache lists and bypass dirty tracking
+    if patient_id in manager.clinical_cache:
+        interp = manager.clinical_cache[patient_id]
+        raw_cache = dict(raw_cache)
+        if 'problem' in interp:
+            # We prefer interpreted problems if available
+            raw_cache['problems'] = list(interp['problem'])
+        if 'medication' in interp:
+            raw_cache['medications'] = list(interp['medication'])
+    return raw_cache
+
+
 @app.post("/ai/narrative/{patient_id}")
 async def generate_patient_narrative(patient_id: str, request: NarrativeRequest):
     """
@@ -868,33 +1509,43 @@ async def generate_patient_narrative(patient_id: str, request: NarrativeRequest)
     The engine now handles the 'Sorting' (VascularProfile creation) internally
     to ensure the LLM only sees clean data.
     """
-    logger.info("=" * 60)
+    logger.info(_BANNER)
     logger.info(f"[NARRATIVE API] Processing for: {patient_id}")
 
-    # 1. ABSORB: Get Raw Data from Cache
-    if patient_id not in manager.patient_cache:
+    raw_cache = narrative_input(patient_id)
+    if raw_cache is None:
         return {"error": "Patient data not found in RAM. Navigate to chart first."}
 
-    raw_cache = manager.patient_cache[patient_id]
-    
-    # Optional: Merge Interpreted Data (Layer 3) into Raw Cache before sending
-    if patient_id in manager.clinical_cache:
-        interp = manager.clinical_cache[patient_id]
-        if 'problem' in interp:
-            # We prefer interpreted problems if available
-            raw_cache['problems'] = interp['problem']
-        if 'medication' in interp:
-            raw_cache['medications'] = interp['medication']
-
     # 2. SORT & SYNTHESIZE (Handled by Engine)
     engine = get_narrative_engine()
     try:
-        result = await engine.generate_narrative(patient_id, raw_cache, request.include_vision)
+        result = await engine.generate_narrative(
+            patient_id, raw_cache, request.include_vision, batch=request.batch
+        )
         return result
     except Exception as e:
         logger.error(f"[NARRATIVE API] Failed: {e}")
         return {"error": str(e)}
 
+
+@app.post("/ai/narrative/{patient_id}/stream")
+async def stream_patient_narrative(patient_id: str, request: NarrativeRequest):
+    """
+    Same narrative as /ai/narrative/{patient_id}, streamed as plain text
+    while Gemini generates it so the UI can render the first sentence early.
+    """
+    logger.info(f"[NARRATIVE API] Streaming for: {patient_id}")
+
+    raw_cache = narrative_input(patient_id)
+    if raw_cache is None:
+        return {"error": "Patient data not found in RAM. Navigate to chart first."}
+
+    engine = get_narrative_engine()
+    return StreamingResponse(
+        engine.stream_narrative(patient_id, raw_cache, request.include_vision),
+        media_type="text/plain; charset=utf-8"
+    )
+
 # ============================================================================
 # EVENT INDEXER ENDPOINTS (Layer 2)
 # ============================================================================
@@ -986,8 +1637,16 @@ async def list_interpreters():
     }
 
 
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response if the client's If-None-Match already names etag, else None."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in (t.strip() for t in if_none_match.split(','))):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
 @app.get("/clinical/{patient_id}")
-async def get_clinical_data(patient_id: str, category: Optional[str] = None):
+async def get_clinical_data(request: Request, patient_id: str, category: Optional[str] = None):
     """
     Get interpreted clinical data for a patient.
 
@@ -1002,6 +1661,10 @@ async def get_clinical_data(patient_id: str, category: Optional[str] = None):
             "available_patients": list(manager.clinical_cache.keys())
         }
 
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
+
     cache = manager.clinical_cache[patient_id]
 
     if category:
@@ -1012,15 +1675,15 @@ async def get_clinical_data(patient_id: str, category: Optional[str] = None):
                 "error": f"No {category} data found",
                 "available_categories": list(cache.keys())
             }
-        return {
+        return ORJSONResponse(manager.clinical_view(patient_id, ('clinical', category), lambda: {
             "patient_id": patient_id,
             "category": category,
             "count": len(cache[category]),
             "records": cache[category]
-        }
+        }), headers={"ETag": etag})
 
     # Return all categories
-    return {
+    return ORJSONResponse(manager.clinical_view(patient_id, ('clinical', None), lambda: {
         "patient_id": patient_id,
         "categories": {
             cat: {
@@ -1029,11 +1692,11 @@ async def get_clinical_data(patient_id: str, category: Optional[str] = None):
             }
             for cat, records in cache.items()
         }
-    }
+    }), headers={"ETag": etag})
 
 
 @app.get("/clinical/{patient_id}/medications")
-async def get_medications(patient_id: str, antithrombotic_only: bool = False):
+async def get_medications(request: Request, patient_id: str, antithrombotic_only: bool = False):
     """
     Get interpreted medications for a patient.
 
@@ -1043,21 +1706,28 @@ async def get_medications(patient_id: str, antithrombotic_only: bool = False):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    meds = manager.clinical_cache[patient_id].get('medication', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    if antithrombotic_only:
-        meds = [m for m in meds if m.get('is_antithrombotic', False)]
+    def build() -> dict:
+        if antithrombotic_only:
+            meds = manager.clinical_partitions.get(patient_id, {}).get('antithrombotic', [])
+        else:
+            meds = manager.clinical_cache[patient_id].get('medication', [])
 
-    return {
-        "patient_id": patient_id,
-        "count": len(meds),
-        "antithrombotic_filter": antithrombotic_only,
-        "medications": meds
-    }
+        return {
+            "patient_id": patient_id,
+            "count": len(meds),
+            "antithrombotic_filter": antithrombotic_only,
+            "medications": meds
+        }
+
+    return ORJSONResponse(manager.clinical_view(patient_id, ('medications', antithrombotic_only), build), headers={"ETag": etag})
 
 
 @app.get("/clinical/{patient_id}/problems")
-async def get_problems(patient_id: str, vascular_only: bool = False):
+async def get_problems(request: Request, patient_id: str, vascular_only: bool = False):
     """
     Get interpreted problems/diagnoses for a patient.
 
@@ -1067,21 +1737,28 @@ async def get_problems(patient_id: str, vascular_only: bool = False):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    problems = manager.clinical_cache[patient_id].get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    if vascular_only:
-        problems = [p for p in problems if p.get('is_vascular', False) or p.get('is_cardiovascular_risk', False)]
+    def build() -> dict:
+        if vascular_only:
+            problems = manager.clinical_partitions.get(patient_id, {}).get('vascular_or_cv_risk', [])
+        else:
+            problems = manager.clinical_cache[patient_id].get('problem', [])
 
-    return {
-        "patient_id": patient_id,
-        "count": len(problems),
-        "vascular_filter": vascular_only,
-        "problems": problems
-    }
+        return {
+            "patient_id": patient_id,
+            "count": len(problems),
+            "vascular_filter": vascular_only,
+            "problems": problems
+        }
+
+    return ORJSONResponse(manager.clinical_view(patient_id, ('problems', vascular_only), build), headers={"ETag": etag})
 
 
 @app.get("/clinical/{patient_id}/summary")
-async def get_clinical_summary(patient_id: str):
+async def get_clinical_summary(request: Request, patient_id: str):
     """
     Get a clinical summary for vascular surgery decision support.
 
@@ -1093,34 +1770,43 @@ async def get_clinical_summary(patient_id: str):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    cache = manager.clinical_cache[patient_id]
-    meds = cache.get('medication', [])
-    problems = cache.get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    # Extract critical data for vascular surgery
-    antithrombotics = [m for m in meds if m.get('is_antithrombotic', False)]
-    vascular_dx = [p for p in problems if p.get('is_vascular', False)]
-    cv_risk_factors = [p for p in problems if p.get('is_cardiovascular_risk', False)]
+    def build() -> dict:
+        cache = manager.clinical_cache[patient_id]
+        meds = cache.get('medication', [])
+        problems = cache.get('problem', [])
 
-    return {
-        "patient_id": patient_id,
-        "summary": {
-            "antithrombotic_medications": {
-                "count": len(antithrombotics),
-                "items": [{"name": m['name'], "status": m.get('status', 'active')} for m in antithrombotics]
-            },
-            "vascular_diagnoses": {
-                "count": len(vascular_dx),
-                "items": [{"name": p['display_name'], "icd10": p.get('icd10_code')} for p in vascular_dx]
+        # Critical data for vascular surgery, projected as records were interpreted
+        # (MedicationSummary / ProblemSummary items serialize straight from orjson)
+        partitions = manager.clinical_partitions.get(patient_id, {})
+        antithrombotics = partitions.get('antithrombotic_items', [])
+        vascular_dx = partitions.get('vascular_items', [])
+        cv_risk_factors = partitions.get('cv_risk_items', [])
+
+        return {
+            "patient_id": patient_id,
+            "summary": {
+                "antithrombotic_medications": {
+                    "count": len(antithrombotics),
+                    "items": antithrombotics
+                },
+                "vascular_diagnoses": {
+                    "count": len(vascular_dx),
+                    "items": vascular_dx
+                },
+                "cardiovascular_risk_factors": {
+                    "count": len(cv_risk_factors),
+                    "items": cv_risk_factors
+                }
             },
-            "cardiovascular_risk_factors": {
-                "count": len(cv_risk_factors),
-                "items": [{"name": p['display_name'], "icd10": p.get('icd10_code')} for p in cv_risk_factors]
-            }
-        },
-        "total_medications": len(meds),
-        "total_problems": len(problems)
-    }
+            "total_medications": len(meds),
+            "total_problems": len(problems)
+        }
+
+    return ORJSONResponse(manager.clinical_view(patient_id, ('summary',), build), headers={"ETag": etag})
 
 
 # ============================================================================
@@ -1128,7 +1814,7 @@ async def get_clinical_summary(patient_id: str):
 # ============================================================================
 
 @app.get("/ai/briefing/{patient_id}")
-async def get_surgical_briefing(patient_id: str):
+async def get_surgical_briefing(request: Request, patient_id: str):
     """
     Generate an AI-powered surgical briefing for the patient.
 
@@ -1141,26 +1827,26 @@ async def get_surgical_briefing(patient_id: str):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    cache = manager.clinical_cache[patient_id]
-    meds = cache.get('medication', [])
-    problems = cache.get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
     # Generate clinical context
-    context = generate_context(patient_id, meds, problems)
+    context = manager.get_or_build_context(patient_id)
 
-    # Generate briefing
-    briefing = generate_briefing(context)
+    # Generate briefing (once per clinical version, however many tabs ask for it)
+    briefing = manager.clinical_view(patient_id, ('briefing',), lambda: generate_briefing(context))
 
-    return {
+    return ORJSONResponse({
         "patient_id": patient_id,
         "briefing": briefing,
         "context": context.to_dict(),
         "generated_at": context.generated_at
-    }
+    }, headers={"ETag": etag})
 
 
 @app.get("/ai/med-alert/{patient_id}")
-async def get_medication_alert(patient_id: str):
+async def get_medication_alert(request: Request, patient_id: str):
     """
     Generate medication management alerts for surgical planning.
 
@@ -1172,24 +1858,24 @@ async def get_medication_alert(patient_id: str):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    cache = manager.clinical_cache[patient_id]
-    meds = cache.get('medication', [])
-    problems = cache.get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    context = generate_context(patient_id, meds, problems)
-    alert = generate_med_alert(context)
+    context = manager.get_or_build_context(patient_id)
+    alert = manager.clinical_view(patient_id, ('med_alert',), lambda: generate_med_alert(context))
 
-    return {
+    return ORJSONResponse({
         "patient_id": patient_id,
         "alert": alert,
         "antithrombotic_count": len(context.antithrombotics),
         "anticoagulants": [m['name'] for m in context.anticoagulants],
         "antiplatelets": [m['name'] for m in context.antiplatelets]
-    }
+    }, headers={"ETag": etag})
 
 
 @app.get("/ai/context/{patient_id}")
-async def get_clinical_context(patient_id: str, format: str = "json"):
+async def get_clinical_context(request: Request, patient_id: str, format: str = "json"):
     """
     Generate structured clinical context for LLM integration.
 
@@ -1202,28 +1888,28 @@ async def get_clinical_context(patient_id: str, format: str = "json"):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    cache = manager.clinical_cache[patient_id]
-    meds = cache.get('medication', [])
-    problems = cache.get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    context = generate_context(patient_id, meds, problems)
+    context = manager.get_or_build_context(patient_id)
 
     if format == "prompt":
-        return {
+        return ORJSONResponse({
             "patient_id": patient_id,
             "prompt": context.to_prompt(),
             "format": "prompt"
-        }
+        }, headers={"ETag": etag})
 
-    return {
+    return ORJSONResponse({
         "patient_id": patient_id,
         "context": context.to_dict(),
         "format": "json"
-    }
+    }, headers={"ETag": etag})
 
 
 @app.get("/ai/risk/{patient_id}")
-async def get_risk_assessment(patient_id: str):
+async def get_risk_assessment(request: Request, patient_id: str):
     """
     Generate cardiovascular risk assessment for surgical planning.
 
@@ -1238,11 +1924,11 @@ async def get_risk_assessment(patient_id: str):
     if patient_id not in manager.clinical_cache:
         return {"patient_id": patient_id, "error": "No clinical data found"}
 
-    cache = manager.clinical_cache[patient_id]
-    meds = cache.get('medication', [])
-    problems = cache.get('problem', [])
+    etag = manager.clinical_etag(patient_id)
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
 
-    context = generate_context(patient_id, meds, problems)
+    context = manager.get_or_build_context(patient_id)
 
     # Calculate risk score
     risk_factors = []
@@ -1260,7 +1946,7 @@ async def get_risk_assessment(patient_id: str):
     risk_count = len(risk_factors)
     risk_level = "HIGH" if risk_count >= 3 else "MODERATE" if risk_count >= 1 else "LOW"
 
-    return {
+    return ORJSONResponse({
         "patient_id": patient_id,
         "risk_level": risk_level,
         "risk_score": risk_count,
@@ -1271,20 +1957,23 @@ async def get_risk_assessment(patient_id: str):
             "claudication": context.claudication,
             "critical_limb_ischemia": context.critical_limb_ischemia
         }
-    }
+    }, headers={"ETag": etag})
 
 
 @app.get("/debug/cache/{patient_id}")
-async def debug_patient_cache(patient_id: str):
+async def debug_patient_cache(patient_id: str, full: bool = False):
     """
     Debug endpoint: Get raw cache data for a patient.
     Helps identify data structure issues.
+
+    Returns counts and a medication sample by default; pass full=true to
+    include the whole cache entry (can be megabytes for a real chart).
     """
     if patient_id not in manager.patient_cache:
         return {"error": "Patient not found", "available": list(manager.patient_cache.keys())}
 
     cache = manager.patient_cache[patient_id]
-    return {
+    response = {
         "patient_id": patient_id,
         "cache_keys": list(cache.keys()),
         "medications_count": len(cache.get('medications', [])),
@@ -1292,8 +1981,10 @@ async def debug_patient_cache(patient_id: str):
         "problems_count": len(cache.get('problems', [])),
         "labs_count": len(cache.get('labs', [])),
         "allergies_count": len(cache.get('allergies', [])),
-        "raw_cache": cache
     }
+    if full:
+        response["raw_cache"] = cache
+    return ORJSONResponse(response)
 
 
 @app.get("/captured-endpoints")
@@ -1302,9 +1993,13 @@ async def get_captured_endpoints():
     Get all captured endpoint patterns for discovery analysis.
     Returns data in format compatible with /discovery/analyze-traffic.
     """
+    version, cached = manager.captured_endpoints_cache
+    if cached is not None and version == manager.endpoint_history_version:
+        return cached
+
     endpoints = []
     for pattern, data in manager.endpoint_history.items():
-        avg_size = sum(data['sizes']) / len(data['sizes']) if data['sizes'] else 0
+        avg_size = data['size_total'] / data['count'] if data['count'] else 0
         endpoints.append({
             "path": pattern,
             "count": data['count'],
@@ -1316,11 +2011,13 @@ async def get_captured_endpoints():
     # Sort by count descending
     endpoints.sort(key=lambda x: x['count'], reverse=True)
 
-    return {
+    response = {
         "endpoints": endpoints,
         "total_unique": len(endpoints),
         "total_requests": sum(e['count'] for e in endpoints)
     }
+    manager.captured_endpoints_cache = (manager.endpoint_history_version, response)
+    return response
 
 
 # ============================================================================
@@ -1330,6 +2027,47 @@ async def get_captured_endpoints():
 from fastapi import Request, Header
 from typing import Optional
 
+def _extract_ingest_patient_id(data: Any) -> Optional[Any]:
+    """
+    Patient ID carried inside an ingest payload, when the body has none.
+    Priority: data.patientId > data.raw.patientId > data.raw._meta.chartId > data._meta.chartId
+    """
+    if not isinstance(data, dict):
+        return None
+    if pid := data.get('patientId'):
+        return pid
+    if isinstance(raw := data.get('raw'), dict):
+        if pid := raw.get('patientId'):
+            return pid
+        if isinstance(meta := raw.get('_meta'), dict) and (pid := meta.get('chartId')):
+            return pid
+    if isinstance(meta := data.get('_meta'), dict):
+        return meta.get('chartId')
+    return None
+
+
+def describe_ingest_payload(data: dict):
+    """Log top-level and compound-section keys of an ingest payload (TRACE_INGEST diagnostics)."""
+    logger.debug("  Data keys: %s", list(data.keys())[:15])
+    # Log nested keys for Athena compound payloads
+    for key in COMPOUND_KEYS & data.keys():
+        nested = data[key]
+        if isinstance(nested, dict):
+            logger.debug("  📦 %s keys: %s", key, list(nested.keys())[:5])
+        elif isinstance(nested, list):
+            logger.debug("  📦 %s: list with %d items", key, len(nested))
+
+
+async def read_capped_body(request: Request, limit: int) -> Optional[bytearray]:
+    """Buffer the request body, giving up (None) as soon as it grows past limit bytes."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            return None
+    return body
+
+
 @app.post("/ingest")
 async def ingest_payload(request: Request, x_source: Optional[str] = Header(None)):
     """
@@ -1337,51 +2075,46 @@ async def ingest_payload(request: Request, x_source: Optional[str] = Header(None
     This is an alternative to the WebSocket approach, with offline queue support.
     """
     try:
-        body = await request.json()
-
-        logger.info("=" * 60)
-        logger.info("🔥 HTTP INGEST RECEIVED")
-        logger.info(f"  Source Header: {x_source or 'none'}")
-
-        # Extract fields from the new payload format
-        url = body.get('url', '')
-        method = body.get('method', 'GET')
-        data = body.get('data', {})
-        source = body.get('source', 'unknown')
-        timestamp = body.get('timestamp', datetime.now().isoformat())
-        size = body.get('size', 0)
-
-        # Extract patient ID from multiple possible locations
-        # Priority: body.patientId > data.patientId > data.raw.patientId > data._meta.chartId > data.raw._meta.chartId
-        patient_id = body.get('patientId')
-        if not patient_id and isinstance(data, dict):
-            patient_id = data.get('patientId')
-            if not patient_id and 'raw' in data and isinstance(data.get('raw'), dict):
-                patient_id = data['raw'].get('patientId')
-                if not patient_id and '_meta' in data['raw']:
-                    patient_id = data['raw'].get('_meta', {}).get('chartId')
-            if not patient_id and '_meta' in data:
-                patient_id = data.get('_meta', {}).get('chartId')
-
-        logger.info(f"  Method: {method}")
-        logger.info(f"  URL: {url[:100]}{'...' if len(url) > 100 else ''}")
-        logger.info(f"  Source: {source}")
-        logger.info(f"  Patient ID extracted: {patient_id or 'none'}")
-        logger.info(f"  Size: {size} bytes")
-        logger.info(f"  Data type: {type(data).__name__}")
-        if isinstance(data, dict):
-            keys = list(data.keys())[:15]
-            logger.info(f"  Data keys: {keys}")
-            # Log nested keys for Athena compound payloads
-            for key in ['active_medications', 'allergies', 'active_problems', 'measurements', 'demographics']:
-                if key in data:
-                    nested = data[key]
-                    if isinstance(nested, dict):
-                        logger.info(f"  📦 {key} keys: {list(nested.keys())[:5]}")
-                    elif isinstance(nested, list):
-                        logger.info(f"  📦 {key}: list with {len(nested)} items")
-        logger.info(f"  Frontend connections: {len(manager.frontend_connections)}")
-        logger.info(f"  Current patients cached: {len(manager.patient_cache)}")
+        # Reject oversized posts before buffering them (declared length first, then while streaming)
+        declared_size = request.headers.get('content-length')
+        raw_body = None
+        if not (declared_size and declared_size.isdigit() and int(declared_size) > INGEST_MAX_BYTES):
+            raw_body = await read_capped_body(request, INGEST_MAX_BYTES)
+        if raw_body is None:
+            logger.warning("Ingest rejected: body exceeds %d bytes", INGEST_MAX_BYTES)
+            # Same 200 + status shape as other ingest errors, so the extension doesn't queue it for retry
+            return {
+                "status": "error",
+                "message": f"Payload exceeds {INGEST_MAX_BYTES} bytes"
+            }
+
+        # Parse and validate the raw body bytes in one pass; defaults come from IngestBody
+        body = IngestBody.model_validate_json(raw_body)
+        now_iso = _fast_iso()
+
+        url = body.url
+        method = body.method
+        data = body.data
+        source = body.source
+        size = body.size
+
+        patient_id = body.patientId or _extract_ingest_patient_id(data)
+
+        logger.info("HTTP INGEST %s %.100s (patient=%s, source=%s)", method, url, patient_id or 'none', source)
+
+        # Per-request diagnostics: DEBUG only, lazy %-formatting so nothing is built when disabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  Source Header: %s", x_source or 'none')
+            logger.debug("  URL: %s", _trunc(url))
+            logger.debug("  Size: %s bytes", size)
+            logger.debug("  Data type: %s", type(data).__name__)
+            logger.debug("  Frontend connections: %d", len(manager.frontend_connections))
+            logger.debug("  Current patients cached: %d", len(manager.patient_cache))
+
+        # Payload key introspection is opt-in (TRACE_INGEST=1) and runs on a worker
+        # thread so the walk never delays the ingest response
+        if TRACE_INGEST and isinstance(data, dict):
+            asyncio.get_running_loop().run_in_executor(None, describe_ingest_payload, data)
 
         # Convert to internal format for processing
         internal_payload = {
@@ -1391,8 +2124,9 @@ async def ingest_payload(request: Request, x_source: Optional[str] = Header(None
             'patientId': patient_id  # Include extracted patient ID
         }
 
-        # Process through the same pipeline as WebSocket
-        await manager.process_athena_payload(internal_payload)
+        # Same pipeline as the WebSocket, run by an ingest worker so the extension
+        # isn't held for FHIR conversion; a full queue holds the request (backpressure)
+        await manager.enqueue_ingest(internal_payload, len(raw_body))
 
         # Emit telemetry for Observer
         await emit_telemetry(
@@ -1411,28 +2145,24 @@ async def ingest_payload(request: Request, x_source: Optional[str] = Header(None
         # If we have a patient ID from active fetch, set it as current context
         if patient_id and source == 'active-fetch':
             manager.current_patient_id = patient_id
-            logger.info(f"  Set current patient context to: {patient_id}")
+            logger.debug("  Set current patient context to: %s", patient_id)
 
-        # Notify frontend that Chrome is active
-        await manager.broadcast_to_frontend({
-            "type": "STATUS_UPDATE",
-            "data": "CONNECTED"
-        })
+        # Notify frontend that Chrome is active (coalesced under an ingest burst)
+        await manager.broadcast_status("CONNECTED")
 
-        logger.success = lambda msg: logger.info(f"✅ {msg}")
-        logger.info("✅ Ingest successful")
-        logger.info("=" * 60)
+        logger.debug("✅ Ingest queued")
 
-        return {
-            "status": "ok",
-            "processed": True,
-            "timestamp": datetime.now().isoformat(),
+        return ORJSONResponse({
+            "status": "queued",
+            "processed": False,
+            "timestamp": now_iso,
             "patientId": patient_id
-        }
+        }, status_code=202)
 
     except Exception as e:
         logger.error(f"Ingest error: {e}")
-        logger.exception("Full traceback:")
+        if _err_sampler.should_log():
+            logger.exception("Full traceback:")
         # Emit error telemetry
         await emit_telemetry(
             stage="backend",
@@ -1446,6 +2176,44 @@ async def ingest_payload(request: Request, x_source: Optional[str] = Header(None
         }
 
 
+# Exact frames websocketService.ts sends, for the frontend socket's no-parse fast path
+_PONG_HEADS = {'{"action":"PONG"', b'{"action":"PONG"'}
+_PONG_HEAD_LEN = len('{"action":"PONG"')
+_SET_MODE_FRAMES = {}
+for _mode in ScraperMode:
+    _frame = '{"action":"SET_MODE","mode":"%s"}' % _mode.value
+    _SET_MODE_FRAMES[_frame] = _SET_MODE_FRAMES[_frame.encode()] = _mode.value
+
+
+def ping_frame() -> bytes:
+    """Heartbeat PING, pre-encoded for send_bytes (no send_json/UTF-8 encode per frame)."""
+    return orjson.dumps({"type": "PING", "timestamp": _fast_iso()})
+
+
+async def receive_frame(websocket: WebSocket) -> Union[str, bytes]:
+    """
+    Receive one WebSocket frame as-is (text or binary).
+
+    orjson parses both str and bytes, so binary frames skip the UTF-8
+    decode that receive_text() would force, while text frames from the
+    existing clients keep working.
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    data = message.get("text")
+    if data is None:
+        data = message.get("bytes") or b""
+    return data
+
+
+def frame_size(data: Union[str, bytes]) -> int:
+    """Byte length of a received frame; text frames are sized as their UTF-8 encoding."""
+    if isinstance(data, bytes) or data.isascii():
+        return len(data)
+    return len(data.encode())
+
+
 @app.websocket("/ws/chrome")
 async def chrome_websocket_endpoint(websocket: WebSocket):
     """
@@ -1463,7 +2231,7 @@ async def chrome_websocket_endpoint(websocket: WebSocket):
             while True:
                 await asyncio.sleep(30)  # Send ping every 30 seconds
                 try:
-                    await websocket.send_json({"type": "PING", "timestamp": datetime.now().isoformat()})
+                    await websocket.send_bytes(ping_frame())
                     logger.debug("Heartbeat PING sent to Chrome")
                 except Exception:
                     break  # Connection closed, exit heartbeat
@@ -1476,33 +2244,35 @@ async def chrome_websocket_endpoint(websocket: WebSocket):
         while True:
             # Receive data from Chrome extension with timeout
             try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=120.0)
+                data = await asyncio.wait_for(receive_frame(websocket), timeout=120.0)
             except asyncio.TimeoutError:
                 # No message in 120 seconds - send ping to check if connection is alive
                 try:
-                    await websocket.send_json({"type": "PING", "timestamp": datetime.now().isoformat()})
+                    await websocket.send_bytes(ping_frame())
                     continue
                 except Exception:
                     logger.warning("Chrome connection stale - no response to ping")
                     break
 
-            logger.debug(f"Raw data received from Chrome ({len(data)} bytes)")
+            wire_size = frame_size(data)
+            logger.debug("Raw data received from Chrome (%d bytes)", wire_size)
 
             try:
-                payload = json.loads(data)
+                payload = orjson.loads(data)
                 # Handle PONG responses
                 if payload.get('type') == 'PONG':
                     logger.debug("Heartbeat PONG received from Chrome")
                     continue
                 logger.debug("JSON parsed successfully")
                 # Process the AthenaNet payload
-                await manager.process_athena_payload(payload)
-            except json.JSONDecodeError as e:
+                await manager.process_athena_payload(payload, wire_size=wire_size)
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Invalid JSON from Chrome: {e}")
                 logger.error(f"Raw data: {data[:500]}...")
             except Exception as e:
                 logger.error(f"Error processing Chrome data: {e}")
-                logger.exception("Full traceback:")
+                if _err_sampler.should_log():
+                    logger.exception("Full traceback:")
 
     except WebSocketDisconnect:
         pass  # Normal disconnect
@@ -1516,10 +2286,7 @@ async def chrome_websocket_endpoint(websocket: WebSocket):
             pass
         manager.disconnect_chrome(websocket)
         # Notify frontend about Chrome disconnection
-        await manager.broadcast_to_frontend({
-            "type": "STATUS_UPDATE",
-            "data": "DISCONNECTED"
-        })
+        await manager.broadcast_status("DISCONNECTED")
 
 
 @app.websocket("/ws/frontend")
@@ -1539,7 +2306,7 @@ async def frontend_websocket_endpoint(websocket: WebSocket):
             while True:
                 await asyncio.sleep(30)  # Send ping every 30 seconds
                 try:
-                    await websocket.send_json({"type": "PING", "timestamp": datetime.now().isoformat()})
+                    await websocket.send_bytes(ping_frame())
                     logger.debug("Heartbeat PING sent to frontend")
                 except Exception:
                     break  # Connection closed, exit heartbeat
@@ -1553,20 +2320,31 @@ async def frontend_websocket_endpoint(websocket: WebSocket):
             # Receive commands from frontend with timeout
             try:
                 # Use wait_for with timeout to detect stale connections
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=120.0)
+                data = await asyncio.wait_for(receive_frame(websocket), timeout=120.0)
             except asyncio.TimeoutError:
                 # No message in 120 seconds - send ping to check if connection is alive
                 try:
-                    await websocket.send_json({"type": "PING", "timestamp": datetime.now().isoformat()})
+                    await websocket.send_bytes(ping_frame())
                     continue
                 except Exception:
                     logger.warning("Frontend connection stale - no response to ping")
                     break
 
-            logger.debug(f"Message from frontend: {data}")
+            logger.debug("Message from frontend: %s", data)
+
+            # The frontend's JSON.stringify output is byte-stable, so heartbeat acks and
+            # mode changes are matched without parsing; anything else goes to orjson
+            if data[:_PONG_HEAD_LEN] in _PONG_HEADS:
+                logger.debug("Heartbeat PONG received from frontend")
+                continue
+            fast_mode = _SET_MODE_FRAMES.get(data)
+            if fast_mode:
+                logger.info("Frontend action received: SET_MODE")
+                manager.set_mode(fast_mode)
+                continue
 
             try:
-                message = json.loads(data)
+                message = orjson.loads(data)
                 action = message.get('action', '')
 
                 # Handle PONG responses (heartbeat acknowledgment)
@@ -1580,7 +2358,7 @@ async def frontend_websocket_endpoint(websocket: WebSocket):
                     mode = message.get('mode', 'PASSIVE')
                     manager.set_mode(mode)
 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.warning(f"Invalid JSON from frontend: {data}")
             except Exception as e:
                 logger.error(f"Error processing frontend message: {e}")
@@ -1604,40 +2382,46 @@ async def get_patient(patient_id: str):
     logger.info(f"Patient requested: {patient_id}")
 
     if patient_id in manager.patient_cache:
-        cache = manager.patient_cache[patient_id]
-        patient = build_patient_from_aggregated_data(
-            patient_id=patient_id,
-            patient_data=cache.get('patient'),
-            vitals_data=cache.get('vitals'),
-            medications_data=cache.get('medications'),
-            problems_data=cache.get('problems'),
-            unknown_data=cache.get('unknown')
-        )
-        logger.info(f"Patient found: {patient.name}")
-        return {"patient": patient.model_dump()}
+        # Recency only matters for eviction; a read doesn't change /patients
+        manager.patient_cache.move_to_end(patient_id)
+        logger.info(f"Patient found: {patient_id}")
+        body = b'{"patient":' + manager.get_patient_json(patient_id) + b'}'
+        return Response(body, media_type="application/json")
 
     logger.warning(f"Patient not found: {patient_id}")
     return {"error": "Patient not found", "patient_id": patient_id}
 
 
 @app.get("/patients")
-async def list_patients():
+async def list_patients(request: Request):
     """List all patients in cache."""
     logger.info(f"Listing all patients ({len(manager.patient_cache)} in cache)")
 
-    patients = []
-    for patient_id, cache in manager.patient_cache.items():
-        patient = build_patient_from_aggregated_data(
-            patient_id=patient_id,
-            patient_data=cache.get('patient'),
-            vitals_data=cache.get('vitals'),
-            medications_data=cache.get('medications'),
-            problems_data=cache.get('problems'),
-            unknown_data=cache.get('unknown')
-        )
-        patients.append(patient.model_dump())
+    etag = f'W/"patients-{manager.patients_version}"'
+    if (unchanged := not_modified(request, etag)) is not None:
+        return unchanged
+    headers = {"ETag": etag}
 
-    return {"patients": patients, "count": len(patients)}
+    if manager.patients_list_cache is not None:
+        return Response(manager.patients_list_cache, media_type="application/json", headers=headers)
+
+    # Patients are built and encoded by the update flusher; splice the cached bytes
+    patients = [manager.get_patient_json(patient_id) for patient_id in list(manager.patient_cache)]
+    if len(patients) < PATIENTS_STREAM_THRESHOLD:
+        body = b'{"patients":[' + b','.join(patients) + b'],"count":%d}' % len(patients)
+        manager.patients_list_cache = body
+        return Response(body, media_type="application/json", headers=headers)
+
+    # Large cache: one patient per chunk so the full body is never joined in memory
+    def stream():
+        yield b'{"patients":['
+        for i, patient in enumerate(patients):
+            if i:
+                yield b','
+            yield patient
+        yield b'],"count":%d}' % len(patients)
+
+    return StreamingResponse(stream(), media_type="application/json", headers=headers)
 
 
 @app.delete("/cache")
@@ -1645,6 +2429,10 @@ async def clear_cache():
     """Clear the patient cache."""
     count = len(manager.patient_cache)
     manager.patient_cache.clear()
+    manager.patient_json_cache.clear()
+    # Otherwise a chart reloaded within PAYLOAD_DEDUPE_WINDOW is all replays and stays empty
+    manager.recent_payloads.clear()
+    manager.touch_patients()
     logger.warning(f"Patient cache cleared ({count} patients removed)")
     return {"status": "cleared", "patients_removed": count}
 
@@ -1912,13 +2700,14 @@ async def get_vascular_assessment(patient_id: str, surgery_type: str = "vascular
         'surgical_history': cache.get('surgical_history', []),
     }
 
-    # Also check clinical_cache from interpreters
+    # Also check clinical_cache from interpreters (new lists: the cached ones back
+    # the memoized built patient and must only change through update_patient_cache)
     if patient_id in manager.clinical_cache:
         interp_data = manager.clinical_cache[patient_id]
         if 'medication' in interp_data:
-            clinical_data['medications'].extend(interp_data['medication'])
+            clinical_data['medications'] = clinical_data['medications'] + interp_data['medication']
         if 'problem' in interp_data:
-            clinical_data['problems'].extend(interp_data['problem'])
+            clinical_data['problems'] = clinical_data['problems'] + interp_data['problem']
 
     assessment = extract_vascular_assessment(patient_id, clinical_data, surgery_type)
 
@@ -2015,13 +2804,13 @@ async def get_bridging_plan(patient_id: str, surgery_type: str = "vascular", sur
     medications = cache.get('medications', [])
     problems = cache.get('problems', [])
 
-    # Also include interpreted medications
+    # Also include interpreted medications (concatenate: the cached lists must not grow per request)
     if patient_id in manager.clinical_cache:
         interp_data = manager.clinical_cache[patient_id]
         if 'medication' in interp_data:
-            medications.extend(interp_data['medication'])
+            medications = medications + interp_data['medication']
         if 'problem' in interp_data:
-            problems.extend(interp_data['problem'])
+            problems = problems + interp_data['problem']
 
     calculator = AntithromboticBridgingCalculator()
     plan = calculator.calculate_bridging_plan(
@@ -2272,4 +3061,9 @@ async def get_preop_checklist(patient_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="debug")
+    # uvloop (libuv reactor) + httptools cut per-frame/per-request overhead; uvloop has no Windows build
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000, log_level="debug",
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools", ws="websockets"
+    )
@@ -9,16 +9,24 @@ Architecture:
 """
 
 import os
+import re
 import logging
 import json
 import asyncio
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple
+from datetime import date, datetime
 from pydantic import BaseModel
 
 # Google GenAI
 from google import genai
 from google.genai import types
+from google.genai import errors as genai_errors
 
 # The Data Separation Layer - VascularProfile is our firewall
 from vascular_parser import build_vascular_profile, VascularProfile
@@ -26,25 +34,243 @@ from files import get_artifact_store
 
 logger = logging.getLogger("shadow-ehr")
 
+_NL = "\n"
+
+# Most recent artifacts read per vision pass
+VISION_MAX_DOCS = 3
+
+# Outbound Gemini calls are blocking network round-trips; keep them off the
+# default executor so they can't starve FHIR conversion or other to_thread work.
+# Sized so one vision pass runs all its documents at once.
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", str(VISION_MAX_DOCS)))
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "4"))
+
+# Generated narratives kept per identical prompt contents (LRU, with a max age
+# in seconds) so UI reloads and repeat pulls don't re-invoke Gemini
+NARRATIVE_CACHE_MAX = int(os.getenv("NARRATIVE_CACHE_MAX", "128"))
+NARRATIVE_CACHE_TTL = float(os.getenv("NARRATIVE_CACHE_TTL", "900"))
+
+# Narrative requests arriving within NARRATIVE_BATCH_WINDOW seconds of each
+# other (up to NARRATIVE_BATCH_MAX) share one Gemini call
+NARRATIVE_BATCH_MAX = int(os.getenv("NARRATIVE_BATCH_MAX", "8"))
+NARRATIVE_BATCH_WINDOW = float(os.getenv("NARRATIVE_BATCH_WINDOW", "0.25"))
+
+# Lifetime of the explicit Gemini cache holding _STATIC_SCAFFOLD; it is
+# recreated shortly before expiry rather than refreshed in the background
+SCAFFOLD_CACHE_TTL = int(os.getenv("SCAFFOLD_CACHE_TTL", "3600"))
+
+# Invariant part of the narrative prompt. Sent once as a cached system
+# instruction so each call only transmits (and is billed for) the patient data.
+_STATIC_SCAFFOLD = """
+ROLE: Expert Vascular Surgeon's Scribe.
+TASK: Write a comprehensive clinical summary for a vascular surgery patient.
+
+INSTRUCTIONS:
+1. Start with: "This is a [AGE] year-old [GENDER] (DOB: [DOB]) with a history of..."
+   - Example: "This is a 64 year-old female (DOB: 10/10/1960) with a history of..."
+2. Include ALL vascular diagnoses with their ICD-10 codes in parentheses, e.g., "peripheral arterial disease (ICD-10: I70.213)"
+3. List relevant comorbidities using standard abbreviations (HTN, HLD, DM, CAD, CKD, COPD, AFib, tobacco use)
+4. Include presenting complaints: rest pain, claudication, ulcers, etc. with ICD-10 codes when available
+5. Mention active antithrombotic medications (Antiplatelets/Anticoagulants)
+6. Include surgical/vascular history if documented
+7. Style: Professional, thorough, suitable for surgical documentation
+8. ALWAYS include patient demographics (age, sex, DOB) at the start if available
+"""
+
+# Gemini refuses explicit caches below a minimum prompt size (1,024 tokens for
+# 2.5 Flash). Estimate the scaffold at ~4 chars/token and only try caching
+# once it is big enough; until then it is simply sent as the system instruction.
+SCAFFOLD_CACHE_MIN_TOKENS = int(os.getenv("SCAFFOLD_CACHE_MIN_TOKENS", "1024"))
+_SCAFFOLD_CACHEABLE = len(_STATIC_SCAFFOLD) // 4 >= SCAFFOLD_CACHE_MIN_TOKENS
+
+
+# DOB formats accepted, tried in this order (the original parse order)
+_DOB_FORMATS = (
+    "%Y-%m-%d",       # 1960-10-10 (ISO)
+    "%m/%d/%Y",       # 10/10/1960 (US)
+    "%m-%d-%Y",       # 10-10-1960
+    "%Y/%m/%d",       # 1960/10/10
+    "%d/%m/%Y",       # 10/10/1960 (EU)
+    "%Y%m%d",         # 19601010 (compact)
+)
+
+# Common DOB shapes mapped to the formats that can produce them, so usually
+# only those are tried; slash dates are read as US first and as EU only when
+# that fails (e.g. 25/10/1960). Anything unresolved falls back to _DOB_FORMATS.
+_DOB_DISPATCH = (
+    (re.compile(r"\d{4}-\d{1,2}-\d{1,2}"), ("%Y-%m-%d",)),     # 1960-1-5 (unpadded ISO)
+    (re.compile(r"\d{1,2}/\d{1,2}/\d{4}"), ("%m/%d/%Y", "%d/%m/%Y")),
+    (re.compile(r"\d{1,2}-\d{1,2}-\d{4}"), ("%m-%d-%Y",)),     # 10-10-1960
+    (re.compile(r"\d{4}/\d{1,2}/\d{1,2}"), ("%Y/%m/%d",)),     # 1960/10/10
+    (re.compile(r"\d{8}"), ("%Y%m%d",)),                        # 19601010 (compact)
+)
+
+
+# Diagnosis-name keywords (plain substring matches) for grouping the context;
+# each list is one compiled alternation so a name is scanned once per category
+_VASCULAR_KEYWORDS = ("atherosclerosis", "arterial", "venous", "vascular", "aneurysm",
+                      "stenosis", "occlusion", "claudication", "ischemic", "ulcer",
+                      "pvd", "pad", "carotid", "aortic", "bypass", "stent")
+_COMORBIDITY_KEYWORDS = ("hypertension", "htn", "diabetes", "dm", "hyperlipidemia",
+                         "hld", "cad", "coronary", "ckd", "chronic kidney",
+                         "copd", "smoking", "tobacco", "afib", "atrial fibrillation",
+                         "heart", "cardiac")
+_VASCULAR_TERMS = re.compile("|".join(map(re.escape, _VASCULAR_KEYWORDS)))
+_COMORBIDITY_TERMS = re.compile("|".join(map(re.escape, _COMORBIDITY_KEYWORDS)))
+
+
+# Framing for a batched call: each patient's contents go under a numbered
+# header, and Gemini is asked to echo the headers so the reply can be split
+_BATCH_PREAMBLE = (
+    "The input below covers {count} patients, each under a line of the form "
+    "===PATIENT_<n>===. Write a separate narrative for every patient following "
+    "the instructions. Start each narrative with its patient's header line "
+    "exactly as given, in the same order, and write nothing else.\n\n"
+)
+_BATCH_HEADER = re.compile(r"^\s*===PATIENT_(\d+)===\s*$", re.MULTILINE)
+
+
+@lru_cache(maxsize=2048)
+def _parse_dob(dob_raw: str) -> Optional[date]:
+    """Parse a DOB string; cached since the same patient's DOB is re-parsed per narrative."""
+    # ISO (1960-10-10, optionally with a time part) is the common case: C fast path
+    try:
+        return date.fromisoformat(dob_raw[:10])
+    except ValueError:
+        pass
+    for pattern, formats in _DOB_DISPATCH:
+        if pattern.fullmatch(dob_raw):
+            for fmt in formats:
+                try:
+                    return datetime.strptime(dob_raw, fmt).date()
+                except ValueError:
+                    continue
+            break
+    # Shapes the dispatch doesn't cover (e.g. 1960101) still get every format
+    for fmt in _DOB_FORMATS:
+        try:
+            return datetime.strptime(dob_raw, fmt).date()
+        except ValueError:
+            continue
+    return None
+
 
 class NarrativeRequest(BaseModel):
     include_vision: bool = False
+    batch: bool = False  # opt in to sharing a Gemini call with other patients (bulk callers)
     narrative_type: str = "vascular_intro"  # vascular_intro, discharge_summary, etc.
 
 
 class NarrativeResponse(BaseModel):
+    # Only ever built server-side from values we produced, so the engine uses
+    # model_construct() and skips validation
     narrative: str
     sources_used: List[str]
     data_quality_score: float  # How complete was the underlying data?
     generated_at: str
 
 
+class _NarrativeBatcher:
+    """Coalesces narrative prompts submitted close together into one Gemini call."""
+
+    def __init__(self, engine: "NarrativeEngine"):
+        self._engine = engine
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, contents: str) -> asyncio.Future:
+        """Queue one patient's contents; the future resolves to (narrative, safe_to_cache)."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((contents, future))
+        return future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + NARRATIVE_BATCH_WINDOW
+            while len(batch) < NARRATIVE_BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Callers that already timed out have cancelled their futures
+            batch = [(contents, future) for contents, future in batch if not future.done()]
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            if len(batch) == 1:
+                results = [(await self._engine._generate_text(batch[0][0]), True)]
+            else:
+                results = await self._generate_batch([contents for contents, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _generate_batch(self, contents: List[str]) -> List[Tuple[str, bool]]:
+        """
+        One call for several patients; any narrative missing from the reply is generated alone.
+
+        Each result carries whether it may be cached: a batched narrative is
+        attributed to its patient only by the headers Gemini echoes back, so
+        it is cacheable only when every header appears exactly once.
+        """
+        logger.info(f"[NARRATIVE] Batching {len(contents)} narratives into one Gemini call")
+        prompt = _BATCH_PREAMBLE.format(count=len(contents)) + "".join(
+            f"===PATIENT_{i}===\n{text}\n\n" for i, text in enumerate(contents, 1)
+        )
+        reply = await self._engine._generate_text(prompt)
+
+        # split() yields [preamble, n1, body1, n2, body2, ...]
+        pieces = _BATCH_HEADER.split(reply)
+        numbers = [int(n) for n in pieces[1::2]]
+        narratives = {n: body.strip() for n, body in zip(numbers, pieces[2::2])}
+        well_formed = sorted(numbers) == list(range(1, len(contents) + 1))
+        if not well_formed:
+            logger.warning("[NARRATIVE] Batched reply headers don't match the request - not caching it")
+
+        results = [(narratives.get(i, ""), well_formed) for i in range(1, len(contents) + 1)]
+        missing = [i for i, (text, _) in enumerate(results) if not text]
+        if missing:
+            logger.warning(f"[NARRATIVE] Batched reply missing {len(missing)} narratives - generating individually")
+            retries = await asyncio.gather(*(self._engine._generate_text(contents[i]) for i in missing))
+            for i, text in zip(missing, retries):
+                results[i] = (text, True)
+        return results
+
+
 class NarrativeEngine:
     def __init__(self):
+        self._llm_pool = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="gemini")
+        self._llm_sem = asyncio.Semaphore(LLM_MAX_INFLIGHT)
+        # Name of the cached scaffold (None: caching unavailable) and when to
+        # recreate or retry it. The lock only guards these fields; one pool
+        # thread at a time (_scaffold_cache_creating) makes the network call.
+        self._scaffold_cache: Optional[str] = None
+        self._scaffold_cache_until = 0.0
+        self._scaffold_cache_creating = False
+        self._scaffold_cache_lock = threading.Lock()
+        # blake2b(contents) -> (narrative, stored_at monotonic)
+        self._narrative_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._batcher = _NarrativeBatcher(self)
         api_key = os.environ.get("GEMINI_API_KEY")
         if api_key:
             self.client = genai.Client(api_key=api_key)
-            self.model_id = "gemini-2.0-flash"
+            self.model_id = "gemini-2.5-flash"
+            if not _SCAFFOLD_CACHEABLE:
+                logger.info("NarrativeEngine: prompt scaffold below the context-cache minimum; sending it inline")
         else:
             self.client = None
             logger.warning("NarrativeEngine: No API Key found. AI features disabled.")
@@ -53,7 +279,8 @@ class NarrativeEngine:
         self,
         patient_id: str,
         raw_cache_data: Dict[str, Any],
-        include_vision: bool = False
+        include_vision: bool = False,
+        batch: bool = False
     ) -> NarrativeResponse:
         """
         Orchestrates the data sorting and narrative generation.
@@ -61,19 +288,167 @@ class NarrativeEngine:
         1. ABSORB: Take raw cache.
         2. SORT: Run strict extractors (VascularProfile).
         3. SYNTHESIZE: Send *only* sorted data to LLM.
+
+        With batch=True the call may share one Gemini request with other
+        patients' narratives submitted within NARRATIVE_BATCH_WINDOW.
         """
         logger.info("=" * 60)
         logger.info(f"[NARRATIVE] Processing for patient: {patient_id}")
 
         if not self.client:
             logger.error("[NARRATIVE] No Gemini client available!")
-            return NarrativeResponse(
+            return NarrativeResponse.model_construct(
                 narrative="AI Service Unavailable. Please configure GEMINI_API_KEY.",
                 sources_used=[],
                 data_quality_score=0.0,
                 generated_at=datetime.now().isoformat()
             )
 
+        contents, quality_score, doc_sources = await self._build_contents(
+            patient_id, raw_cache_data, include_vision
+        )
+        sources = ["Structured EHR Data"] + doc_sources
+
+        cache_key = self._narrative_key(contents)
+        cached = self._cached_narrative(cache_key)
+        if cached is not None:
+            logger.info("[NARRATIVE] Identical context - serving cached narrative")
+            logger.info("=" * 60)
+            return NarrativeResponse.model_construct(
+                narrative=cached,
+                sources_used=sources + ["[cached]"],
+                data_quality_score=quality_score,
+                generated_at=datetime.now().isoformat()
+            )
+
+        # --- STEP 4: GENERATION ---
+        logger.info("[NARRATIVE] Step 3: Generating narrative with Gemini...")
+
+        try:
+            if batch:
+                narrative, cacheable = await asyncio.wait_for(self._batcher.submit(contents), timeout=30.0)
+            else:
+                narrative = await asyncio.wait_for(self._generate_text(contents), timeout=30.0)
+                cacheable = True
+            if cacheable:
+                self._store_narrative(cache_key, narrative)
+            logger.info(f"[NARRATIVE] Generated {len(narrative)} chars")
+
+        except asyncio.TimeoutError:
+            logger.error("[NARRATIVE] Gemini call timed out after 30 seconds")
+            narrative = "Narrative generation timed out. Please try again."
+        except Exception as e:
+            logger.error(f"[NARRATIVE] Gemini error: {e}")
+            logger.exception("Full traceback:")
+            narrative = f"Could not generate narrative: {str(e)}"
+
+        logger.info("=" * 60)
+        return NarrativeResponse.model_construct(
+            narrative=narrative,
+            sources_used=sources,
+            data_quality_score=quality_score,
+            generated_at=datetime.now().isoformat()
+        )
+
+    async def _generate_text(self, contents: str) -> str:
+        """Run the synchronous Gemini call in the dedicated LLM pool and return its text."""
+        loop = asyncio.get_running_loop()
+        async with self._llm_sem:
+            response = await loop.run_in_executor(self._llm_pool, self._generate_sync, contents)
+        usage = response.usage_metadata
+        if usage:
+            logger.info("[NARRATIVE] Tokens: prompt=%s cached=%s",
+                        usage.prompt_token_count, usage.cached_content_token_count)
+        return response.text.strip()
+
+    async def stream_narrative(
+        self,
+        patient_id: str,
+        raw_cache_data: Dict[str, Any],
+        include_vision: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Same pipeline as generate_narrative, but yields the narrative text
+        as Gemini produces it instead of waiting for the whole response.
+        """
+        logger.info("=" * 60)
+        logger.info(f"[NARRATIVE] Streaming for patient: {patient_id}")
+
+        if not self.client:
+            logger.error("[NARRATIVE] No Gemini client available!")
+            yield "AI Service Unavailable. Please configure GEMINI_API_KEY."
+            return
+
+        contents, _, _ = await self._build_contents(patient_id, raw_cache_data, include_vision)
+
+        cache_key = self._narrative_key(contents)
+        cached = self._cached_narrative(cache_key)
+        if cached is not None:
+            logger.info("[NARRATIVE] Identical context - serving cached narrative")
+            yield cached
+            return
+
+        # The SDK stream is a blocking iterator: pump it on the LLM pool and
+        # hand chunks back to the event loop through a queue. `stop` tells the
+        # pump to close the stream when we exit early (client gone, stall), so
+        # it doesn't hold a pool worker until the model finishes.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def pump():
+            stream = self._stream_sync(contents)
+            try:
+                for chunk in stream:
+                    if stop.is_set():
+                        break
+                    if chunk.text:
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                stream.close()
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        parts: List[str] = []
+        failed = False
+        async with self._llm_sem:
+            pumping = loop.run_in_executor(self._llm_pool, pump)
+            try:
+                while True:
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=30.0)
+                    except asyncio.TimeoutError:
+                        logger.error("[NARRATIVE] Gemini stream stalled for 30 seconds")
+                        yield "\n\nNarrative generation timed out. Please try again."
+                        return
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        logger.error(f"[NARRATIVE] Gemini stream error: {item}")
+                        failed = True
+                        yield f"\n\nCould not generate narrative: {item}"
+                        continue
+                    parts.append(item)
+                    yield item
+            finally:
+                stop.set()
+            await pumping
+
+        narrative = "".join(parts)
+        if not failed:
+            self._store_narrative(cache_key, narrative.strip())
+        logger.info(f"[NARRATIVE] Streamed {len(narrative)} chars")
+        logger.info("=" * 60)
+
+    async def _build_contents(
+        self,
+        patient_id: str,
+        raw_cache_data: Dict[str, Any],
+        include_vision: bool
+    ) -> Tuple[str, float, List[str]]:
+        """Steps 1-3: sort the cache into a profile, run vision, and build the per-patient prompt."""
         # --- STEP 1: THE DATA SEPARATION LAYER ---
         # We do NOT send raw_cache_data to the LLM. We build a typed Profile first.
         logger.info("[NARRATIVE] Step 1: Sorting data through VascularProfile...")
@@ -105,60 +480,143 @@ class NarrativeEngine:
         quality_score = self._calculate_data_quality(profile, raw_cache_data)
         logger.info(f"[NARRATIVE] Data quality score: {quality_score:.2f}")
 
-        # --- STEP 4: GENERATION ---
-        logger.info("[NARRATIVE] Step 3: Generating narrative with Gemini...")
-
-        prompt = f"""
-ROLE: Expert Vascular Surgeon's Scribe.
-TASK: Write a comprehensive clinical summary for a vascular surgery patient.
-
-INPUT DATA (Sorted & Verified):
-{llm_context}
-
-INSTRUCTIONS:
-1. Start with: "This is a [AGE] year-old [GENDER] (DOB: [DOB]) with a history of..."
-   - Example: "This is a 64 year-old female (DOB: 10/10/1960) with a history of..."
-2. Include ALL vascular diagnoses with their ICD-10 codes in parentheses, e.g., "peripheral arterial disease (ICD-10: I70.213)"
-3. List relevant comorbidities using standard abbreviations (HTN, HLD, DM, CAD, CKD, COPD, AFib, tobacco use)
-4. Include presenting complaints: rest pain, claudication, ulcers, etc. with ICD-10 codes when available
-5. Mention active antithrombotic medications (Antiplatelets/Anticoagulants)
-6. Include surgical/vascular history if documented
-7. Style: Professional, thorough, suitable for surgical documentation
-8. ALWAYS include patient demographics (age, sex, DOB) at the start if available
-
-OUTPUT:
-"""
-
+        # The ROLE/TASK/INSTRUCTIONS scaffold travels as the (cached) system instruction
+        contents = f"INPUT DATA (Sorted & Verified):\n{llm_context}\n\nOUTPUT:"
+        return contents, quality_score, doc_sources
+
+    @staticmethod
+    def _narrative_key(contents: str) -> str:
+        return hashlib.blake2b(contents.encode(), digest_size=16).hexdigest()
+
+    def _cached_narrative(self, key: str) -> Optional[str]:
+        """Narrative generated for the same contents within NARRATIVE_CACHE_TTL, if any."""
+        hit = self._narrative_cache.get(key)
+        if hit is None:
+            return None
+        narrative, stored_at = hit
+        if time.monotonic() - stored_at > NARRATIVE_CACHE_TTL:
+            del self._narrative_cache[key]
+            return None
+        self._narrative_cache.move_to_end(key)
+        return narrative
+
+    def _store_narrative(self, key: str, narrative: str):
+        if not narrative:
+            return
+        self._narrative_cache[key] = (narrative, time.monotonic())
+        self._narrative_cache.move_to_end(key)
+        while len(self._narrative_cache) > NARRATIVE_CACHE_MAX:
+            self._narrative_cache.popitem(last=False)
+
+    def _scaffold_cache_name(self) -> Optional[str]:
+        """Name of the cached _STATIC_SCAFFOLD, creating it when missing or near expiry."""
+        if not _SCAFFOLD_CACHEABLE:
+            return None
+        with self._scaffold_cache_lock:
+            now = time.monotonic()
+            # While another thread recreates it, keep using the current (still
+            # valid, it's refreshed early) cache, or go inline if there is none
+            if now < self._scaffold_cache_until or self._scaffold_cache_creating:
+                return self._scaffold_cache
+            self._scaffold_cache_creating = True
+
+        name = None
         try:
-            # Run the synchronous Gemini call in a thread pool
-            loop = asyncio.get_event_loop()
-            response = await asyncio.wait_for(
-                loop.run_in_executor(None, lambda: self.client.models.generate_content(
-                    model=self.model_id,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(temperature=0.1)
-                )),
-                timeout=30.0
+            cache = self.client.caches.create(
+                model=self.model_id,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=_STATIC_SCAFFOLD,
+                    ttl=f"{SCAFFOLD_CACHE_TTL}s"
+                )
             )
-            narrative = response.text.strip()
-            logger.info(f"[NARRATIVE] Generated {len(narrative)} chars")
-
-        except asyncio.TimeoutError:
-            logger.error("[NARRATIVE] Gemini call timed out after 30 seconds")
-            narrative = "Narrative generation timed out. Please try again."
+            name = cache.name
+            logger.info(f"[NARRATIVE] Created scaffold context cache {name}")
         except Exception as e:
-            logger.error(f"[NARRATIVE] Gemini error: {e}")
-            logger.exception("Full traceback:")
-            narrative = f"Could not generate narrative: {str(e)}"
+            # Retry after one TTL; calls meanwhile send the scaffold inline
+            logger.info(f"[NARRATIVE] Context cache unavailable, sending scaffold inline: {e}")
+
+        with self._scaffold_cache_lock:
+            self._scaffold_cache = name
+            # Recreate a minute early so a call never references an expired cache
+            self._scaffold_cache_until = now + max(SCAFFOLD_CACHE_TTL - 60, 60)
+            self._scaffold_cache_creating = False
+        return name
+
+    @staticmethod
+    def _is_stale_cache_error(error: genai_errors.ClientError) -> bool:
+        """True when the request failed because the cached content is gone, not for other 4xx."""
+        if error.code == 404:
+            return True
+        return error.code == 400 and "cache" in str(error.message or error).lower()
+
+    @staticmethod
+    def _narrative_config(cache_name: Optional[str]) -> types.GenerateContentConfig:
+        """Generation config referencing the scaffold cache, or carrying the scaffold inline."""
+        # 2.5 Flash thinks by default; a templated summary gains nothing from it
+        # and would lose the latency the Flash switch was for
+        no_thinking = types.ThinkingConfig(thinking_budget=0)
+        if cache_name:
+            return types.GenerateContentConfig(
+                temperature=0.1, cached_content=cache_name, thinking_config=no_thinking
+            )
+        return types.GenerateContentConfig(
+            temperature=0.1, system_instruction=_STATIC_SCAFFOLD, thinking_config=no_thinking
+        )
 
-        sources = ["Structured EHR Data"] + doc_sources
+    def _drop_scaffold_cache(self, cache_name: str, error: Exception):
+        """Forget a cache the API rejected so the next call recreates it."""
+        # Cache deleted or expired server-side: go uncached this time
+        logger.warning(f"[NARRATIVE] Cached generation failed ({error}); retrying without cache")
+        with self._scaffold_cache_lock:
+            if self._scaffold_cache == cache_name:
+                self._scaffold_cache_until = 0.0
+
+    def _generate_sync(self, contents: str):
+        """Blocking narrative call (runs on _llm_pool), via the scaffold cache when available."""
+        cache_name = self._scaffold_cache_name()
+        if cache_name:
+            try:
+                return self.client.models.generate_content(
+                    model=self.model_id,
+                    contents=contents,
+                    config=self._narrative_config(cache_name)
+                )
+            except genai_errors.ClientError as e:
+                # Rate limits and bad input are re-raised: resending uncached would double traffic
+                if not self._is_stale_cache_error(e):
+                    raise
+                self._drop_scaffold_cache(cache_name, e)
+        return self.client.models.generate_content(
+            model=self.model_id,
+            contents=contents,
+            config=self._narrative_config(None)
+        )
 
-        logger.info("=" * 60)
-        return NarrativeResponse(
-            narrative=narrative,
-            sources_used=sources,
-            data_quality_score=quality_score,
-            generated_at=datetime.now().isoformat()
+    def _stream_sync(self, contents: str) -> Iterator[Any]:
+        """Blocking streamed narrative call (runs on _llm_pool); same cache fallback as _generate_sync."""
+        cache_name = self._scaffold_cache_name()
+        if cache_name:
+            stream = self.client.models.generate_content_stream(
+                model=self.model_id,
+                contents=contents,
+                config=self._narrative_config(cache_name)
+            )
+            try:
+                # A rejected cache surfaces on the first chunk
+                first = next(stream, None)
+            except genai_errors.ClientError as e:
+                if not self._is_stale_cache_error(e):
+                    raise
+                self._drop_scaffold_cache(cache_name, e)
+            else:
+                if first is not None:
+                    yield first
+                yield from stream
+                return
+        yield from self.client.models.generate_content_stream(
+            model=self.model_id,
+            contents=contents,
+            config=self._narrative_config(None)
         )
 
     def _transform_cache_to_parser_input(self, raw_cache: Dict[str, Any]) -> Dict[str, Any]:
@@ -308,28 +766,11 @@ OUTPUT:
         age = "Unknown age"
         dob_str = None
         if dob:
-            dob_parsed = None
             dob_raw = str(dob).strip()
-
-            # Try multiple date formats
-            date_formats = [
-                "%Y-%m-%d",       # 1960-10-10 (ISO)
-                "%m/%d/%Y",       # 10/10/1960 (US)
-                "%m-%d-%Y",       # 10-10-1960
-                "%Y/%m/%d",       # 1960/10/10
-                "%d/%m/%Y",       # 10/10/1960 (EU)
-                "%Y%m%d",         # 19601010 (compact)
-            ]
-
-            for fmt in date_formats:
-                try:
-                    dob_parsed = datetime.strptime(dob_raw, fmt)
-                    break
-                except ValueError:
-                    continue
+            dob_parsed = _parse_dob(dob_raw)
 
             if dob_parsed:
-                years = (datetime.now() - dob_parsed).days // 365
+                years = (date.today() - dob_parsed).days // 365
                 age = f"{years} years old"
                 dob_str = dob_parsed.strftime("%m/%d/%Y")
             else:
@@ -338,14 +779,6 @@ OUTPUT:
                 logger.warning(f"[NARRATIVE] Could not parse DOB: {dob_raw}")
 
         # Format diagnoses WITH ICD-10 codes - separate into categories
-        vascular_keywords = ["atherosclerosis", "arterial", "venous", "vascular", "aneurysm",
-                             "stenosis", "occlusion", "claudication", "ischemic", "ulcer",
-                             "pvd", "pad", "carotid", "aortic", "bypass", "stent"]
-        comorbidity_keywords = ["hypertension", "htn", "diabetes", "dm", "hyperlipidemia",
-                                "hld", "cad", "coronary", "ckd", "chronic kidney",
-                                "copd", "smoking", "tobacco", "afib", "atrial fibrillation",
-                                "heart", "cardiac"]
-
         def format_dx_with_icd(dx):
             """Format diagnosis with ICD-10 code if available."""
             if dx.icd10_code:
@@ -359,9 +792,9 @@ OUTPUT:
             if dx.status == "active":
                 dx_lower = dx.name.lower()
                 formatted = format_dx_with_icd(dx)
-                if any(term in dx_lower for term in vascular_keywords):
+                if _VASCULAR_TERMS.search(dx_lower):
                     vascular_dx.append(formatted)
-                elif any(term in dx_lower for term in comorbidity_keywords):
+                elif _COMORBIDITY_TERMS.search(dx_lower):
                     comorbidity_dx.append(formatted)
                 else:
                     other_dx.append(formatted)
@@ -381,34 +814,24 @@ OUTPUT:
         allergies = [f"{a.allergen}: {a.surgical_implication or 'caution'}"
                      for a in profile.critical_allergies]
 
-        context = f"""
-PATIENT: {profile.name}
-MRN: {profile.mrn}
-DOB: {dob_str if dob_str else "Unknown"}
-AGE: {age}
-SEX: {gender.upper() if gender != "unknown" else "Unknown"}
-
-VASCULAR DIAGNOSES:
-{chr(10).join(f"- {d}" for d in vascular_dx) if vascular_dx else "None documented"}
-
-CARDIOVASCULAR RISK FACTORS/COMORBIDITIES:
-{chr(10).join(f"- {d}" for d in comorbidity_dx) if comorbidity_dx else "None documented"}
-
-OTHER ACTIVE DIAGNOSES:
-{chr(10).join(f"- {d}" for d in other_dx) if other_dx else "None"}
-
-ACTIVE ANTITHROMBOTICS:
-{", ".join(meds) if meds else "None documented"}
-
-SURGICAL/VASCULAR HISTORY:
-{"; ".join(hx) if hx else "None documented in structured data"}
-
-CRITICAL ALLERGIES:
-{", ".join(allergies) if allergies else "None documented"}
-
-DOCUMENT EXTRACTIONS (Vision):
-{vision_text if vision_text else "No additional documents processed."}
-"""
+        vascular_block = _NL.join([f"- {d}" for d in vascular_dx]) or "None documented"
+        comorbidity_block = _NL.join([f"- {d}" for d in comorbidity_dx]) or "None documented"
+        other_block = _NL.join([f"- {d}" for d in other_dx]) or "None"
+
+        context = "".join([
+            f"\nPATIENT: {profile.name}\n",
+            f"MRN: {profile.mrn}\n",
+            f"DOB: {dob_str if dob_str else 'Unknown'}\n",
+            f"AGE: {age}\n",
+            f"SEX: {gender.upper() if gender != 'unknown' else 'Unknown'}\n",
+            "\nVASCULAR DIAGNOSES:\n", vascular_block, "\n",
+            "\nCARDIOVASCULAR RISK FACTORS/COMORBIDITIES:\n", comorbidity_block, "\n",
+            "\nOTHER ACTIVE DIAGNOSES:\n", other_block, "\n",
+            "\nACTIVE ANTITHROMBOTICS:\n", ", ".join(meds) or "None documented", "\n",
+            "\nSURGICAL/VASCULAR HISTORY:\n", "; ".join(hx) or "None documented in structured data", "\n",
+            "\nCRITICAL ALLERGIES:\n", ", ".join(allergies) or "None documented", "\n",
+            "\nDOCUMENT EXTRACTIONS (Vision):\n", vision_text or "No additional documents processed.", "\n",
+        ])
         return context
 
     async def _extract_from_documents(self, patient_id: str) -> tuple[str, List[str]]:
@@ -432,51 +855,60 @@ DOCUMENT EXTRACTIONS (Vision):
 
             logger.info(f"[NARRATIVE] Found {len(artifacts)} artifacts for patient {patient_id}")
 
-            # Sort by date, take top 3 most recent
+            # Sort by date, take the VISION_MAX_DOCS most recent
             recent_artifacts = sorted(
                 [a for a in artifacts if a is not None],
                 key=lambda x: x.stored_at or "",
                 reverse=True
-            )[:3]
+            )[:VISION_MAX_DOCS]
         except Exception as e:
             logger.error(f"[NARRATIVE] Error accessing artifact store: {e}")
             return "", []
 
-        extracted_info = []
-        sources = []
-
+        targets = []
         for art in recent_artifacts:
             # Only process images/PDFs, skip JSON
             if not art.mime_type or "json" in art.mime_type:
                 continue
-
             data = store.get(art.artifact_id)
-            if not data:
-                continue
+            if data:
+                targets.append((art, data))
 
-            try:
-                loop = asyncio.get_event_loop()
-                prompt = ("Read this medical document. List any surgical procedures and their dates "
-                         "found in the text. Format: Procedure - Date. Be concise.")
-
-                response = await loop.run_in_executor(None, lambda d=data, m=art.mime_type:
-                    self.client.models.generate_content(
-                        model=self.model_id,
-                        contents=[
-                            types.Part.from_bytes(data=d, mime_type=m),
-                            prompt
-                        ]
-                    )
-                )
-                if response.text:
-                    extracted_info.append(f"[From {art.original_filename}]: {response.text.strip()}")
-                    sources.append(f"Doc: {art.original_filename}")
+        # Each document is an independent round-trip; issue them together
+        results = await asyncio.gather(
+            *(self._extract_one(art, data) for art, data in targets),
+            return_exceptions=True
+        )
 
-            except Exception as e:
-                logger.error(f"[NARRATIVE] Vision failed on {art.artifact_id}: {e}")
+        extracted_info = []
+        sources = []
+        for (art, _), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.error(f"[NARRATIVE] Vision failed on {art.artifact_id}: {result}")
+                continue
+            if result:
+                extracted_info.append(f"[From {art.original_filename}]: {result}")
+                sources.append(f"Doc: {art.original_filename}")
 
         return "\n".join(extracted_info), sources
 
+    async def _extract_one(self, art, data: bytes) -> str:
+        """Runs the vision prompt against a single artifact and returns the stripped text."""
+        prompt = ("Read this medical document. List any surgical procedures and their dates "
+                  "found in the text. Format: Procedure - Date. Be concise.")
+        loop = asyncio.get_running_loop()
+        async with self._llm_sem:
+            response = await loop.run_in_executor(self._llm_pool, lambda:
+                self.client.models.generate_content(
+                    model=self.model_id,
+                    contents=[
+                        types.Part.from_bytes(data=data, mime_type=art.mime_type),
+                        prompt
+                    ]
+                )
+            )
+        return response.text.strip() if response.text else ""
+
     def _calculate_data_quality(self, profile: VascularProfile, raw_cache: Dict[str, Any]) -> float:
         """
         Calculate a data completeness score (0-1).
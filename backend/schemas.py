@@ -21,6 +21,17 @@ class AthenaPayload(BaseModel):
     payload: Any = None
 
 
+class IngestBody(BaseModel):
+    """HTTP /ingest body posted by the extension's background worker."""
+    url: str = ""
+    method: str = "GET"
+    data: Any = {}
+    patientId: Optional[Any] = None  # string chart id, occasionally numeric
+    source: str = "unknown"
+    timestamp: Optional[str] = None
+    size: int = 0
+
+
 class VitalComponent(BaseModel):
     """Individual vital sign component."""
     code: str
@@ -16,4 +16,8 @@ from backend.main import app
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "backend.main:app", host="0.0.0.0", port=8000, reload=True,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools", ws="websockets"
+    )
@@ -2,10 +2,12 @@ import { LogEntry, Patient, ScraperStatus } from '../types';
 
 type WebSocketMessage =
   | { type: 'LOG_ENTRY'; data: LogEntry }
+  | { type: 'LOG_BATCH'; data: LogEntry[] }
   | { type: 'PATIENT_UPDATE'; data: Patient }
   | { type: 'STATUS_UPDATE'; data: string }
   | { type: 'PING'; timestamp: string }
   | { type: 'CLINICAL_UPDATE'; data: any }
+  | { type: 'CLINICAL_UPDATE_BATCH'; data: { patient_id: string; updates: any[] } }
   | { type: 'OBSERVER_TELEMETRY'; source: string; event: any };
 
 // Emit telemetry for Medical Mirror Observer (via postMessage)
@@ -27,6 +29,13 @@ function emitObserverTelemetry(stage: string, action: string, success: boolean,
   }
 }
 
+// Backend sends pre-serialized JSON as binary frames (broadcasts and heartbeats)
+const frameDecoder = new TextDecoder();
+
+function decodeFrame(data: string | ArrayBuffer): string {
+  return typeof data === 'string' ? data : frameDecoder.decode(data);
+}
+
 // Frontend Logger with styled console output
 const Logger = {
   _log: (level: string, emoji: string, msg: string, data?: any) => {
@@ -84,6 +93,7 @@ class WebSocketService {
     this.onStatusChange?.(ScraperStatus.CONNECTING);
 
     this.socket = new WebSocket(this.url);
+    this.socket.binaryType = 'arraybuffer';
 
     this.socket.onopen = () => {
       Logger.separator();
@@ -106,9 +116,11 @@ class WebSocketService {
     this.socket.onmessage = (event) => {
       this.messagesReceived++;
 
+      const raw = decodeFrame(event.data);
+
       try {
-        const message: WebSocketMessage = JSON.parse(event.data);
-        const msgSize = event.data.length;
+        const message: WebSocketMessage = JSON.parse(raw);
+        const msgSize = raw.length;
 
         Logger.debug(`Message #${this.messagesReceived} received (${msgSize} bytes)`, { type: message.type });
 
@@ -125,6 +137,17 @@ class WebSocketService {
             this.onLogEntry?.(message.data);
             break;
 
+          case 'LOG_BATCH':
+            // Log entries captured within one backend coalescing window
+            this.logsReceived += message.data.length;
+            Logger.data(`LOG_BATCH received (${message.data.length} entries)`, {
+              totalLogs: this.logsReceived
+            });
+            for (const entry of message.data) {
+              this.onLogEntry?.(entry);
+            }
+            break;
+
           case 'PATIENT_UPDATE':
             this.patientsReceived++;
             Logger.separator();
@@ -179,12 +202,19 @@ class WebSocketService {
             Logger.debug('Clinical update received:', message.data);
             break;
 
+          case 'CLINICAL_UPDATE_BATCH':
+            // All categories interpreted from one event, sent as a single frame
+            for (const update of message.data.updates) {
+              Logger.debug('Clinical update received:', { patient_id: message.data.patient_id, ...update });
+            }
+            break;
+
           default:
             Logger.warn('Unknown message type:', message);
         }
       } catch (err) {
         Logger.error('Failed to parse message:', err);
-        Logger.debug('Raw message data:', event.data?.substring(0, 200));
+        Logger.debug('Raw message data:', raw.substring(0, 200));
       }
     };
 